@@ -9,6 +9,15 @@ __version__ = "1.0.0"
 __app_name__ = "Organize Desktop"
 __author__ = "Organize Desktop Team"
 
-from .main import main
-
 __all__ = ["main", "__version__", "__app_name__"]
+
+
+def __getattr__(name):
+    # Imported lazily so "import app" stays cheap for the core modules
+    if name == "main":
+        from .main import main
+        
+        # Importing the submodule binds "main" to it; rebind to the function
+        globals()["main"] = main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,26 @@
 """
 Core module containing business logic and organize integration.
+
+Submodules are imported on first attribute access so that importing the
+package does not pull in organize, PyYAML or watchdog up front.
 """
 
-from .config_manager import ConfigManager
-from .rule_engine import RuleEngine
-from .file_watcher import FileWatcher
-from .settings import Settings
+from importlib import import_module
+
+_EXPORTS = {
+    "ConfigManager": ".config_manager",
+    "RuleEngine": ".rule_engine",
+    "FileWatcher": ".file_watcher",
+    "Settings": ".settings",
+}
 
 __all__ = ["ConfigManager", "RuleEngine", "FileWatcher", "Settings"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -4,16 +4,115 @@ Handles loading, saving, validating, and converting configurations.
 """
 
 import os
-import shutil
+import copy
+import mmap
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Set, Tuple
 
 import yaml
-import platformdirs
 
-from organize import Config, ConfigError
-from organize.find_config import find_config, list_configs, create_example_config
+from ..utils.helpers import write_file_atomic
+
+# organize pulls in its whole schema machinery on import, so it is only
+# imported where a Config is actually built or looked up
+if TYPE_CHECKING:
+    from organize import Config
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+
+def _tag_as_string(loader: Any, tag_suffix: str, node: Any) -> str:
+    """Load a !tagged value the way organize does, as the tag text."""
+    return str(node.tag)
+
+
+# organize registers this on yaml.SafeLoader only; the C loader needs its
+# own copy or configs with !tags fail to load here
+yaml.add_multi_constructor("", _tag_as_string, Loader=_Loader)
+
+# Config files larger than this are read through a memory map
+MMAP_THRESHOLD = 64 * 1024
+
+
+def config_from_obj(obj: Dict[str, Any], config_path: Optional[Path] = None) -> "Config":
+    """
+    Build an organize Config from already-parsed config data.
+    
+    Does what Config.from_string does after its YAML load, so callers that
+    hold the data as dicts skip a dump and re-parse.
+    
+    Args:
+        obj: Config data, e.g. {"rules": [...]}
+        config_path: Config file path used for relative locations
+        
+    Returns:
+        The validated Config
+    """
+    from organize import Config, ConfigError
+    from pydantic import ValidationError
+    
+    if not obj:
+        raise ValueError("Config is empty")
+    try:
+        config = Config(**obj)
+    except ValidationError as e:
+        raise ConfigError(e=e, config_path=config_path) from e
+    config._config_path = config_path
+    return config
+
+
+@lru_cache(maxsize=None)
+def _default_config_dir(xdg_config: Optional[str]) -> Path:
+    """Resolve the organize config directory for an XDG_CONFIG_HOME value."""
+    if xdg_config:
+        return Path(xdg_config).expanduser() / "organize"
+    
+    import platformdirs
+    
+    return platformdirs.user_config_path(appname="organize")
+
+
+def _read_config_text(path: Path) -> str:
+    """
+    Read a configuration file as UTF-8 text.
+    
+    Large files are memory-mapped so the OS pages them in directly instead
+    of going through Python's buffered reader.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, "utf-8")
+        else:
+            text = f.read().decode("utf-8")
+    
+    # Universal newlines, as Path.read_text() would apply
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _clone_rule(value: Any) -> Any:
+    """
+    Copy a parsed rule.
+    
+    Rules are plain YAML data, so dicts, lists and scalars are copied
+    directly; anything else (dates, sets, ...) falls back to deepcopy.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _clone_rule(v) for k, v in value.items()}
+    if value_type is list:
+        return [_clone_rule(v) for v in value]
+    if value_type in (str, int, float, bool) or value is None:
+        return value
+    return copy.deepcopy(value)
 
 
 class ConfigManager:
@@ -50,10 +149,19 @@ rules:
             config_path: Path to a configuration file (optional)
         """
         self._config_path = config_path
-        self._config: Optional[Config] = None
+        self._config: Optional["Config"] = None
+        self._config_stale: bool = False
         self._raw_content: str = ""
+        self._parsed: Optional[Dict[str, Any]] = None
+        self._parsed_source: Optional[str] = None
+        self._raw_dirty: bool = False
         self._last_error: Optional[str] = None
         self._is_modified: bool = False
+        self._parent_ensured: Set[Path] = set()
+        # (content, config path, result) of the last validate() call, and
+        # the same for validate_obj() keyed by repr of the data
+        self._validation: Optional[Tuple[str, Optional[Path], Tuple[bool, Optional[str]]]] = None
+        self._obj_validation: Optional[Tuple[str, Optional[Path], Tuple[bool, Optional[str]]]] = None
     
     @property
     def config_path(self) -> Optional[Path]:
@@ -61,13 +169,21 @@ rules:
         return self._config_path
     
     @property
-    def config(self) -> Optional[Config]:
+    def config(self) -> Optional["Config"]:
         """Get the parsed organize Config object."""
+        if self._config_stale:
+            self._validate_config()
         return self._config
     
     @property
     def raw_content(self) -> str:
-        """Get the raw YAML content."""
+        """
+        Get the raw YAML content.
+        
+        If pending rule edits cannot be serialized, this is the last
+        content that could be, and last_error says why.
+        """
+        self._flush_raw()
         return self._raw_content
     
     @property
@@ -83,7 +199,7 @@ rules:
     @property
     def is_valid(self) -> bool:
         """Check if the current configuration is valid."""
-        return self._config is not None
+        return self.config is not None
     
     @property
     def filename(self) -> str:
@@ -102,6 +218,8 @@ rules:
         Returns:
             True if successful, False otherwise
         """
+        from organize import Config, ConfigError
+        
         if path is not None:
             self._config_path = path
         
@@ -110,7 +228,9 @@ rules:
             return False
         
         try:
-            self._raw_content = self._config_path.read_text(encoding="utf-8")
+            self._raw_content = _read_config_text(self._config_path)
+            self._raw_dirty = False
+            self._config_stale = False
             self._config = Config.from_string(
                 config=self._raw_content,
                 config_path=self._config_path,
@@ -142,8 +262,12 @@ rules:
         Returns:
             True if successful, False otherwise
         """
+        from organize import Config, ConfigError
+        
         try:
             self._raw_content = content
+            self._raw_dirty = False
+            self._config_stale = False
             self._config_path = path
             self._config = Config.from_string(
                 config=content,
@@ -178,35 +302,80 @@ rules:
             self._last_error = "No save path specified"
             return False
         
+        parent = save_path.parent
         try:
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            save_path.write_text(self._raw_content, encoding="utf-8")
+            # Directories already created or checked by an earlier save are skipped
+            if parent not in self._parent_ensured:
+                parent.mkdir(parents=True, exist_ok=True)
+                self._parent_ensured.add(parent)
+            if not self._flush_raw():
+                # Writing the old content would silently drop the rule edits
+                return False
+            write_file_atomic(save_path, self._raw_content.encode("utf-8"), mode=0o644)
             self._config_path = save_path
             self._is_modified = False
             self._last_error = None
             return True
         except Exception as e:
+            self._parent_ensured.discard(parent)
             self._last_error = f"Error saving config: {e}"
             return False
     
-    def set_content(self, content: str) -> bool:
+    def set_content(self, content: str, validate_schema: bool = False) -> bool:
         """
-        Set the raw YAML content and validate it.
+        Set the raw YAML content and check it.
+        
+        Only the YAML syntax is checked by default. Full organize schema
+        validation is deferred until the config or is_valid property is
+        read, or performed immediately when validate_schema is True.
         
         Args:
             content: New YAML content
+            validate_schema: Whether to validate against the organize schema now
             
         Returns:
             True if content is valid, False otherwise
         """
-        old_content = self._raw_content
+        if not self._raw_dirty and self._parsed is not None and content == self._parsed_source:
+            # Same text as the cached parse, so the syntax is already known to be valid
+            parsed = self._parsed
+        else:
+            try:
+                parsed = yaml.load(content, Loader=_Loader)
+            except yaml.YAMLError as e:
+                self._apply_content(content, None)
+                self._config = None
+                self._config_stale = False
+                self._last_error = str(e)
+                return False
+        
+        self._apply_content(content, parsed if isinstance(parsed, dict) else {})
+        if validate_schema:
+            return self._validate_config()
+        return True
+    
+    def _apply_content(self, content: str, parsed: Optional[Dict[str, Any]]) -> None:
+        """Store new raw content and mark the organize Config as stale."""
+        self._is_modified = (content != self._raw_content) or self._is_modified
         self._raw_content = content
-        self._is_modified = (content != old_content) or self._is_modified
+        self._parsed = parsed
+        self._parsed_source = content if parsed is not None else None
+        self._raw_dirty = False
+        self._config = None
+        self._config_stale = True
+        self._last_error = None
+    
+    def _validate_config(self) -> bool:
+        """Build the organize Config from the current raw content."""
+        from organize import Config, ConfigError
         
-        # Try to parse the new content
+        self._config_stale = False
+        if not self._flush_raw():
+            self._config = None
+            return False
         try:
             self._config = Config.from_string(
-                config=content,
+                config=self._raw_content,
                 config_path=self._config_path,
             )
             self._last_error = None
@@ -220,57 +389,146 @@ rules:
         """
         Validate configuration content.
         
+        organize builds its schema models on every Config.from_string call,
+        so the result for the last content and config path is reused.
+        
         Args:
             content: YAML content to validate, or None to validate current
             
         Returns:
             Tuple of (is_valid, error_message)
         """
-        content = content or self._raw_content
+        from organize import Config, ConfigError
+        
+        content = content or self.raw_content
+        
+        cached = self._validation
+        if cached is not None and cached[0] == content and cached[1] == self._config_path:
+            return cached[2]
         
         try:
             Config.from_string(config=content, config_path=self._config_path)
-            return True, None
+            result: Tuple[bool, Optional[str]] = (True, None)
         except ConfigError as e:
-            return False, str(e)
+            result = (False, str(e))
         except yaml.YAMLError as e:
-            return False, f"YAML syntax error: {e}"
+            result = (False, f"YAML syntax error: {e}")
         except Exception as e:
-            return False, str(e)
+            result = (False, str(e))
+        
+        self._validation = (content, self._config_path, result)
+        return result
     
-    def get_rules(self) -> List[Dict[str, Any]]:
+    def validate_obj(self, obj: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
-        Get rules as a list of dictionaries.
+        Validate parsed configuration data without a YAML round trip.
         
+        Args:
+            obj: Config data, e.g. {"rules": [...]}
+            
         Returns:
-            List of rule dictionaries
+            Tuple of (is_valid, error_message)
         """
-        if not self._raw_content:
-            return []
+        from organize import ConfigError
+        
+        key = repr(obj)
+        cached = self._obj_validation
+        if cached is not None and cached[0] == key and cached[1] == self._config_path:
+            return cached[2]
         
         try:
-            data = yaml.safe_load(self._raw_content)
-            return data.get("rules", []) if data else []
-        except yaml.YAMLError:
+            config_from_obj(obj, self._config_path)
+            result: Tuple[bool, Optional[str]] = (True, None)
+        except ConfigError as e:
+            result = (False, str(e))
+        except Exception as e:
+            result = (False, str(e))
+        
+        self._obj_validation = (key, self._config_path, result)
+        return result
+    
+    def _get_parsed_rules(self) -> List[Dict[str, Any]]:
+        """
+        Get the cached rules list, parsing the raw content if needed.
+        
+        The parse is reused for as long as the raw content is the text it
+        was built from, so reloading an unchanged file does not re-parse it.
+        The returned list is owned by the manager; mutators edit it in place
+        and then hand it to set_rules().
+        """
+        if not self._raw_dirty and self._parsed_source != self._raw_content:
+            self._parsed = None
+            self._parsed_source = None
+            if not self._raw_content:
+                return []
+            try:
+                self._parsed = yaml.load(self._raw_content, Loader=_Loader) or {}
+            except yaml.YAMLError:
+                return []
+            self._parsed_source = self._raw_content
+        if self._parsed is None:
             return []
+        return self._parsed.setdefault("rules", [])
+    
+    def get_rules(self) -> List[Dict[str, Any]]:
+        """
+        Get rules as a list of dictionaries.
+        
+        Returns:
+            List of rule dictionaries
+        """
+        return list(self._get_parsed_rules())
     
     def set_rules(self, rules: List[Dict[str, Any]]) -> bool:
         """
         Set rules from a list of dictionaries.
         
+        The YAML text is not regenerated until raw_content is read or the
+        config is saved or validated, so a burst of rule edits costs a
+        single dump.
+        
         Args:
             rules: List of rule dictionaries
             
         Returns:
             True if successful, False otherwise
         """
+        self._parsed = {"rules": list(rules)}
+        self._parsed_source = None
+        self._raw_dirty = True
+        self._is_modified = True
+        self._config = None
+        self._config_stale = True
+        self._last_error = None
+        return True
+    
+    def _flush_raw(self) -> bool:
+        """
+        Regenerate the raw YAML content from pending rule edits.
+        
+        On failure the edits stay pending, so a later flush can retry them.
+        
+        Returns:
+            True if the raw content is up to date, False otherwise
+        """
+        if not self._raw_dirty:
+            return True
+        
         try:
-            data = {"rules": rules}
-            content = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)
-            return self.set_content(content)
-        except Exception as e:
-            self._last_error = str(e)
+            self._raw_content = yaml.dump(
+                self._parsed,
+                Dumper=_Dumper,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+            )
+        except yaml.YAMLError as e:
+            self._last_error = f"Error serializing rules: {e}"
             return False
+        
+        self._parsed_source = self._raw_content
+        self._raw_dirty = False
+        return True
     
     def add_rule(self, rule: Dict[str, Any], index: Optional[int] = None) -> bool:
         """
@@ -283,7 +541,7 @@ rules:
         Returns:
             True if successful, False otherwise
         """
-        rules = self.get_rules()
+        rules = self._get_parsed_rules()
         
         if index is None:
             rules.append(rule)
@@ -303,7 +561,7 @@ rules:
         Returns:
             True if successful, False otherwise
         """
-        rules = self.get_rules()
+        rules = self._get_parsed_rules()
         
         if 0 <= index < len(rules):
             rules[index] = rule
@@ -321,7 +579,7 @@ rules:
         Returns:
             True if successful, False otherwise
         """
-        rules = self.get_rules()
+        rules = self._get_parsed_rules()
         
         if 0 <= index < len(rules):
             rules.pop(index)
@@ -340,7 +598,7 @@ rules:
         Returns:
             True if successful, False otherwise
         """
-        rules = self.get_rules()
+        rules = self._get_parsed_rules()
         
         if 0 <= from_index < len(rules) and 0 <= to_index < len(rules):
             rule = rules.pop(from_index)
@@ -359,11 +617,10 @@ rules:
         Returns:
             True if successful, False otherwise
         """
-        rules = self.get_rules()
+        rules = self._get_parsed_rules()
         
         if 0 <= index < len(rules):
-            import copy
-            new_rule = copy.deepcopy(rules[index])
+            new_rule = _clone_rule(rules[index])
             if "name" in new_rule:
                 new_rule["name"] = f"{new_rule['name']} (copy)"
             rules.insert(index + 1, new_rule)
@@ -381,6 +638,8 @@ rules:
         if not self._config_path or not self._config_path.exists():
             return None
         
+        import shutil
+        
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = self._config_path.with_name(
@@ -393,9 +652,13 @@ rules:
     
     def new(self) -> None:
         """Create a new empty configuration."""
+        from organize import Config
+        
         self._config_path = None
         self._raw_content = self.EXAMPLE_CONFIG
+        self._raw_dirty = False
         self._config = None
+        self._config_stale = False
         self._is_modified = True
         self._last_error = None
         
@@ -408,10 +671,8 @@ rules:
     @staticmethod
     def get_default_config_dir() -> Path:
         """Get the default directory for organize configs."""
-        xdg_config = os.environ.get("XDG_CONFIG_HOME")
-        if xdg_config:
-            return Path(xdg_config).expanduser() / "organize"
-        return platformdirs.user_config_path(appname="organize")
+        # Keyed on the variable, so changes to the environment still apply
+        return _default_config_dir(os.environ.get("XDG_CONFIG_HOME"))
     
     @staticmethod
     def list_available_configs() -> List[Path]:
@@ -421,8 +682,41 @@ rules:
         Returns:
             List of config file paths
         """
+        from organize.find_config import list_configs
+        
         return list(list_configs())
     
+    @staticmethod
+    def list_available_config_names() -> List[str]:
+        """
+        List all available configuration files as path strings.
+        
+        Scans the same directories as list_available_configs() with
+        os.scandir, without building Path objects, for display lists.
+        
+        Returns:
+            Sorted list of config file paths per search directory
+        """
+        from organize.find_config import XDG_CONFIG_DIR, USER_CONFIG_DIR
+        
+        result: List[str] = []
+        seen_dirs: Set[str] = set()
+        for config_dir in (str(XDG_CONFIG_DIR), str(USER_CONFIG_DIR)):
+            if config_dir in seen_dirs:
+                continue
+            seen_dirs.add(config_dir)
+            try:
+                with os.scandir(config_dir) as it:
+                    found = [
+                        entry.path
+                        for entry in it
+                        if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+                    ]
+            except OSError:
+                continue
+            result.extend(sorted(found))
+        return result
+    
     @staticmethod
     def find_config_by_name(name: Optional[str] = None) -> Optional[Path]:
         """
@@ -434,6 +728,8 @@ rules:
         Returns:
             Path to config file, or None if not found
         """
+        from organize.find_config import find_config
+        
         try:
             return find_config(name)
         except Exception:
@@ -450,6 +746,8 @@ rules:
         Returns:
             Path to created config, or None if failed
         """
+        from organize.find_config import create_example_config
+        
         try:
             return create_example_config(name)
         except FileExistsError:
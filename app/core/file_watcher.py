@@ -3,46 +3,114 @@ File system watcher for monitoring directories and config file changes.
 Uses the watchdog library for cross-platform file system events.
 """
 
+import os
+import re
+import sys
+import fnmatch
 import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Callable, Set, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, Callable, Set, List, Dict, Any, Iterable
 from dataclasses import dataclass, field
-from enum import Enum, auto
-
-from watchdog.observers import Observer
-from watchdog.events import (
-    FileSystemEventHandler,
-    FileCreatedEvent,
-    FileModifiedEvent,
-    FileDeletedEvent,
-    FileMovedEvent,
-    DirCreatedEvent,
-    DirDeletedEvent,
-    DirModifiedEvent,
-    DirMovedEvent,
-)
-
-
-class FileEventType(Enum):
+from enum import IntEnum
+
+from watchdog.events import FileSystemEventHandler
+
+# The platform observer backend is only imported once a watcher is started
+if TYPE_CHECKING:
+    from watchdog.observers import Observer
+
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Match fnmatch.fnmatch(), which ignores case where the file system does
+_PATTERN_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+def _compile_patterns(patterns: Iterable[str]) -> List[re.Pattern]:
+    """Compile glob patterns into regular expressions."""
+    return [re.compile(fnmatch.translate(p), _PATTERN_FLAGS) for p in patterns]
+
+
+def _match_filters(path: str, include: List[re.Pattern], ignore: List[re.Pattern]) -> bool:
+    """Check a path's name against compiled include and ignore patterns."""
+    name = os.path.basename(path)
+    
+    if include:
+        if not any(r.match(name) for r in include):
+            return False
+    
+    if ignore:
+        if any(r.match(name) for r in ignore):
+            return False
+    
+    return True
+
+
+@lru_cache(maxsize=128)
+def _resolve_str(path: str) -> str:
+    """Resolve a path string, memoizing the result."""
+    return str(Path(path).resolve())
+
+
+# Event types as plain ints, used on the hot path instead of enum members
+EV_CREATED = 1
+EV_MODIFIED = 2
+EV_DELETED = 3
+EV_MOVED = 4
+
+
+class FileEventType(IntEnum):
     """Type of file system event."""
-    CREATED = auto()
-    MODIFIED = auto()
-    DELETED = auto()
-    MOVED = auto()
+    CREATED = EV_CREATED
+    MODIFIED = EV_MODIFIED
+    DELETED = EV_DELETED
+    MOVED = EV_MOVED
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileEvent:
     """File system event data."""
-    event_type: FileEventType
+    event_type: int  # One of the EV_* constants; compares equal to FileEventType
     path: Path
     is_directory: bool
     dest_path: Optional[Path] = None  # For move events
     
     def __str__(self) -> str:
-        if self.event_type == FileEventType.MOVED:
-            return f"{self.event_type.name}: {self.path} -> {self.dest_path}"
-        return f"{self.event_type.name}: {self.path}"
+        name = FileEventType(self.event_type).name
+        if self.event_type == EV_MOVED:
+            return f"{name}: {self.path} -> {self.dest_path}"
+        return f"{name}: {self.path}"
+
+
+# Free list of FileEvent objects reused across event bursts
+_EVENT_POOL: List[FileEvent] = []
+_EVENT_POOL_MAX = 256
+
+
+def _acquire_event(
+    event_type: int,
+    path: Path,
+    is_directory: bool,
+    dest_path: Optional[Path],
+) -> FileEvent:
+    """Get a FileEvent from the pool, or create one if the pool is empty."""
+    try:
+        event = _EVENT_POOL.pop()
+    except IndexError:
+        return FileEvent(event_type, path, is_directory, dest_path)
+    event.event_type = event_type
+    event.path = path
+    event.is_directory = is_directory
+    event.dest_path = dest_path
+    return event
+
+
+def _release_event(event: FileEvent) -> None:
+    """Return a FileEvent to the pool once its callback has finished."""
+    if len(_EVENT_POOL) < _EVENT_POOL_MAX:
+        _EVENT_POOL.append(event)
 
 
 class FileEventHandler(FileSystemEventHandler):
@@ -57,6 +125,8 @@ class FileEventHandler(FileSystemEventHandler):
         patterns: Optional[Set[str]] = None,
         ignore_patterns: Optional[Set[str]] = None,
         ignore_directories: bool = False,
+        compiled_patterns: Optional[List[re.Pattern]] = None,
+        compiled_ignore: Optional[List[re.Pattern]] = None,
     ):
         """
         Initialize the event handler.
@@ -66,65 +136,63 @@ class FileEventHandler(FileSystemEventHandler):
             patterns: File patterns to include (e.g., {'*.yaml', '*.yml'})
             ignore_patterns: File patterns to ignore
             ignore_directories: Whether to ignore directory events
+            compiled_patterns: Precompiled form of patterns, if available
+            compiled_ignore: Precompiled form of ignore_patterns, if available
         """
         super().__init__()
         self._on_event = on_event
         self._patterns = patterns or set()
         self._ignore_patterns = ignore_patterns or set()
         self._ignore_directories = ignore_directories
+        if compiled_patterns is None:
+            compiled_patterns = _compile_patterns(self._patterns)
+        if compiled_ignore is None:
+            compiled_ignore = _compile_patterns(self._ignore_patterns)
+        self._pattern_res = compiled_patterns
+        self._ignore_res = compiled_ignore
+        self._has_filters = bool(self._pattern_res or self._ignore_res)
     
     def _should_process(self, path: str, is_directory: bool) -> bool:
         """Check if the event should be processed."""
         if is_directory and self._ignore_directories:
             return False
         
-        if self._patterns:
-            name = Path(path).name
-            if not any(self._matches_pattern(name, p) for p in self._patterns):
-                return False
-        
-        if self._ignore_patterns:
-            name = Path(path).name
-            if any(self._matches_pattern(name, p) for p in self._ignore_patterns):
-                return False
+        if not self._has_filters:
+            return True
         
-        return True
+        return _match_filters(path, self._pattern_res, self._ignore_res)
     
-    @staticmethod
-    def _matches_pattern(name: str, pattern: str) -> bool:
-        """Check if a name matches a glob pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(name, pattern)
-    
-    def _emit_event(self, event_type: FileEventType, src_path: str, is_dir: bool, dest_path: Optional[str] = None):
+    def _emit_event(self, event_type: int, src_path: str, is_dir: bool, dest_path: Optional[str] = None):
         """Emit a file event."""
         if self._should_process(src_path, is_dir):
-            event = FileEvent(
-                event_type=event_type,
-                path=Path(src_path),
-                is_directory=is_dir,
-                dest_path=Path(dest_path) if dest_path else None,
+            event = _acquire_event(
+                event_type,
+                Path(src_path),
+                is_dir,
+                Path(dest_path) if dest_path else None,
             )
-            self._on_event(event)
+            try:
+                self._on_event(event)
+            finally:
+                _release_event(event)
     
+    # watchdog events carry is_directory, so no isinstance() dispatch is needed
     def on_created(self, event):
-        is_dir = isinstance(event, DirCreatedEvent)
-        self._emit_event(FileEventType.CREATED, event.src_path, is_dir)
+        self._emit_event(EV_CREATED, event.src_path, event.is_directory)
     
     def on_modified(self, event):
-        is_dir = isinstance(event, DirModifiedEvent)
-        self._emit_event(FileEventType.MODIFIED, event.src_path, is_dir)
+        self._emit_event(EV_MODIFIED, event.src_path, event.is_directory)
     
     def on_deleted(self, event):
-        is_dir = isinstance(event, DirDeletedEvent)
-        self._emit_event(FileEventType.DELETED, event.src_path, is_dir)
+        self._emit_event(EV_DELETED, event.src_path, event.is_directory)
     
     def on_moved(self, event):
-        is_dir = isinstance(event, DirMovedEvent)
-        self._emit_event(FileEventType.MOVED, event.src_path, is_dir, event.dest_path)
+        self._emit_event(
+            EV_MOVED, event.src_path, event.is_directory, event.dest_path
+        )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WatchedPath:
     """Information about a watched path."""
     path: Path
@@ -132,6 +200,18 @@ class WatchedPath:
     patterns: Set[str] = field(default_factory=set)
     ignore_patterns: Set[str] = field(default_factory=set)
     ignore_directories: bool = False
+    compiled_patterns: List[re.Pattern] = field(default_factory=list, repr=False)
+    compiled_ignore: List[re.Pattern] = field(default_factory=list, repr=False)
+    
+    def accepts(self, path: str, is_directory: bool) -> bool:
+        """Check if an event for the given path passes this watch's filters."""
+        if is_directory and self.ignore_directories:
+            return False
+        
+        if not (self.compiled_patterns or self.compiled_ignore):
+            return True
+        
+        return _match_filters(path, self.compiled_patterns, self.compiled_ignore)
 
 
 class FileWatcher:
@@ -143,14 +223,18 @@ class FileWatcher:
     - Pattern-based filtering
     - Event callbacks
     - Thread-safe operation
+    
+    All watches share one event handler; events are routed to the watched
+    path that contains them and filtered with that path's patterns.
     """
     
     def __init__(self):
         """Initialize the file watcher."""
-        self._observer: Optional[Observer] = None
+        self._observer: Optional["Observer"] = None
         self._watches: Dict[str, Any] = {}
         self._watched_paths: Dict[str, WatchedPath] = {}
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._handler = FileEventHandler(on_event=self._route_event)
         
         # Callbacks
         self._on_event: Optional[Callable[[FileEvent], None]] = None
@@ -174,6 +258,9 @@ class FileWatcher:
         """
         Set callback functions.
         
+        FileEvent objects are recycled once on_event returns, so callbacks
+        must copy any fields they want to keep rather than the event itself.
+        
         Args:
             on_event: Called for each file event
             on_error: Called when an error occurs
@@ -193,18 +280,23 @@ class FileWatcher:
                 return True
             
             try:
+                from watchdog.observers import Observer
+                
                 self._observer = Observer()
                 self._observer.start()
-                
-                # Re-add existing watches
-                for key, watched in self._watched_paths.items():
-                    self._add_watch_impl(watched)
-                
-                return True
             except Exception as e:
+                self._observer = None
                 if self._on_error:
                     self._on_error(e)
                 return False
+            
+            watched_paths = list(self._watched_paths.values())
+        
+        # Re-add existing watches outside the lock; scheduling does file IO
+        for watched in watched_paths:
+            self._add_watch_impl(watched)
+        
+        return True
     
     def stop(self) -> None:
         """Stop the file watcher."""
@@ -236,44 +328,47 @@ class FileWatcher:
         Returns:
             True if added successfully
         """
-        path = Path(path).resolve()
-        if not path.exists() or not path.is_dir():
+        key = _resolve_str(str(path))
+        path = Path(key)
+        if not path.is_dir():
             return False
         
-        key = str(path)
+        patterns = patterns or set()
+        ignore_patterns = ignore_patterns or set()
         
         with self._lock:
             watched = WatchedPath(
                 path=path,
                 recursive=recursive,
-                patterns=patterns or set(),
-                ignore_patterns=ignore_patterns or set(),
+                patterns=patterns,
+                ignore_patterns=ignore_patterns,
                 ignore_directories=ignore_directories,
+                compiled_patterns=_compile_patterns(patterns),
+                compiled_ignore=_compile_patterns(ignore_patterns),
             )
             self._watched_paths[key] = watched
-            
-            if self.is_running:
-                return self._add_watch_impl(watched)
-            
-            return True
+            is_running = self.is_running
+        
+        if is_running:
+            return self._add_watch_impl(watched)
+        
+        return True
     
     def _add_watch_impl(self, watched: WatchedPath) -> bool:
-        """Internal method to add a watch."""
+        """Internal method to add a watch. Must be called without the lock held."""
+        observer = self._observer
+        if observer is None:
+            return False
+        
         try:
-            handler = FileEventHandler(
-                on_event=self._handle_event,
-                patterns=watched.patterns,
-                ignore_patterns=watched.ignore_patterns,
-                ignore_directories=watched.ignore_directories,
-            )
-            
-            watch = self._observer.schedule(
-                handler,
+            watch = observer.schedule(
+                self._handler,
                 str(watched.path),
                 recursive=watched.recursive,
             )
             
-            self._watches[str(watched.path)] = watch
+            with self._lock:
+                self._watches[str(watched.path)] = watch
             return True
             
         except Exception as e:
@@ -291,8 +386,14 @@ class FileWatcher:
         Returns:
             True if removed successfully
         """
-        key = str(Path(path).resolve())
+        key = str(path)
+        if key not in self._watched_paths:
+            key = _resolve_str(key)
         
+        return self._remove_path_by_key(key)
+    
+    def _remove_path_by_key(self, key: str) -> bool:
+        """Internal method to remove a watch by its resolved key."""
         with self._lock:
             if key not in self._watched_paths:
                 return False
@@ -311,10 +412,29 @@ class FileWatcher:
     def clear(self) -> None:
         """Remove all watched paths."""
         with self._lock:
-            paths = list(self._watched_paths.keys())
+            keys = list(self._watched_paths.keys())
         
-        for path in paths:
-            self.remove_path(Path(path))
+        for key in keys:
+            self._remove_path_by_key(key)
+    
+    def _find_watch(self, path: str) -> Optional[WatchedPath]:
+        """Find the innermost watched path containing the given path."""
+        watched_paths = self._watched_paths
+        while True:
+            watched = watched_paths.get(path)
+            if watched is not None:
+                return watched
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+    
+    def _route_event(self, event: FileEvent) -> None:
+        """Apply the owning watch's filters and forward the event."""
+        path = str(event.path)
+        watched = self._find_watch(path)
+        if watched is not None and watched.accepts(path, event.is_directory):
+            self._handle_event(event)
     
     def _handle_event(self, event: FileEvent) -> None:
         """Handle a file event."""
@@ -326,17 +446,30 @@ class FileWatcher:
                     self._on_error(e)
 
 
+# Event types that mean the watched config file has new content
+_CONFIG_CHANGE_EVENTS = frozenset((EV_CREATED, EV_MODIFIED))
+
+
 class ConfigFileWatcher(FileWatcher):
     """
     Specialized watcher for organize configuration files.
     Watches for changes to YAML config files.
+    
+    Editors often write a file several times per save, so change
+    notifications are debounced and the callback runs once per burst.
     """
     
+    # Seconds to wait for further events before reporting a change; long
+    # enough to cover an editor's write-to-temp, rename and touch sequence
+    DEBOUNCE_INTERVAL = 0.15
+    
     def __init__(self):
         """Initialize the config file watcher."""
         super().__init__()
         self._config_path: Optional[Path] = None
         self._on_config_changed: Optional[Callable[[Path], None]] = None
+        self._pending_path: Optional[Path] = None
+        self._pending_timer: Optional[threading.Timer] = None
     
     def set_config_callback(self, callback: Callable[[Path], None]) -> None:
         """Set callback for config file changes."""
@@ -352,7 +485,7 @@ class ConfigFileWatcher(FileWatcher):
         Returns:
             True if started successfully
         """
-        config_path = Path(config_path).resolve()
+        config_path = Path(_resolve_str(str(config_path)))
         
         # Stop watching previous config
         if self._config_path:
@@ -363,9 +496,8 @@ class ConfigFileWatcher(FileWatcher):
         # Set up event handler
         def on_event(event: FileEvent):
             if event.path == self._config_path:
-                if event.event_type in (FileEventType.MODIFIED, FileEventType.CREATED):
-                    if self._on_config_changed:
-                        self._on_config_changed(event.path)
+                if event.event_type in _CONFIG_CHANGE_EVENTS:
+                    self._schedule_config_changed(event.path)
         
         self.set_callbacks(on_event=on_event)
         
@@ -376,8 +508,44 @@ class ConfigFileWatcher(FileWatcher):
             patterns={"*.yaml", "*.yml"},
         )
     
+    def _schedule_config_changed(self, path: Path) -> None:
+        """(Re)start the debounce timer for a config change."""
+        with self._lock:
+            self._pending_path = path
+            if self._pending_timer:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(
+                self.DEBOUNCE_INTERVAL, self._fire_config_changed
+            )
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+    
+    def _fire_config_changed(self) -> None:
+        """Report the pending config change once the burst has settled."""
+        with self._lock:
+            path = self._pending_path
+            self._pending_path = None
+            self._pending_timer = None
+        
+        if path and self._on_config_changed:
+            self._on_config_changed(path)
+    
+    def _cancel_pending(self) -> None:
+        """Drop any change notification that has not fired yet."""
+        with self._lock:
+            if self._pending_timer:
+                self._pending_timer.cancel()
+            self._pending_timer = None
+            self._pending_path = None
+    
+    def stop(self) -> None:
+        """Stop the file watcher."""
+        self._cancel_pending()
+        super().stop()
+    
     def unwatch_config(self) -> None:
         """Stop watching the config file."""
+        self._cancel_pending()
         if self._config_path:
             self.remove_path(self._config_path.parent)
             self._config_path = None
@@ -5,19 +5,55 @@ Provides asynchronous execution with progress reporting and logging.
 
 import os
 import sys
+import csv
 import time
 import threading
 import queue
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Optional, Set, Callable, List, Dict, Any
+from typing import Optional, Set, Callable, List, Dict, Any, Deque, Iterable, Union, Tuple
 from enum import Enum, auto
 
 from organize import Config
 from organize.output import Output
 from organize.resource import Resource
 
+from .config_manager import config_from_obj
+
+try:
+    import orjson
+    
+    def _dumps_indented(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:  # optional speedup, fall back to the standard library
+    import json
+    
+    # orjson writes non-ASCII text as is; match it so output is the same
+    def _dumps_indented(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Severity of each log level; entries below the configured minimum are dropped
+_LEVEL_ORDER = {"debug": 10, "info": 20, "success": 20, "warning": 30, "error": 40}
+_DEBUG_LEVEL = _LEVEL_ORDER["debug"]
+
+# Per-entry level ids, used to index the result's per-level counters
+LEVEL_DEBUG, LEVEL_INFO, LEVEL_SUCCESS, LEVEL_WARNING, LEVEL_ERROR, LEVEL_OTHER = range(6)
+_LEVEL_IDS = {
+    "debug": LEVEL_DEBUG,
+    "info": LEVEL_INFO,
+    "success": LEVEL_SUCCESS,
+    "warning": LEVEL_WARNING,
+    "error": LEVEL_ERROR,
+}
+
+# Write buffer used when exporting logs, so large exports need few syscalls
+EXPORT_BUFFER_SIZE = 1 << 20
+
 
 class ExecutionStatus(Enum):
     """Execution status enumeration."""
@@ -30,15 +66,72 @@ class ExecutionStatus(Enum):
     CANCELLED = auto()
 
 
-@dataclass
+_NS_PER_SECOND = 1_000_000_000
+
+
+def _to_ns(timestamp: Union[datetime, int]) -> int:
+    """Convert a datetime (or an int already in nanoseconds) to epoch nanoseconds."""
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp()) * _NS_PER_SECOND + timestamp.microsecond * 1000
+    return timestamp
+
+
+@dataclass(init=False, **_SLOTS)
 class LogEntry:
     """Log entry for execution output."""
-    timestamp: datetime
+    timestamp_ns: int  # nanoseconds since the epoch, as from time.time_ns()
     level: str  # info, warning, error, success, debug
     message: str
     rule_name: Optional[str] = None
     file_path: Optional[str] = None
     action_name: Optional[str] = None
+    level_id: int = field(default=LEVEL_OTHER, repr=False, compare=False)
+    
+    def __init__(
+        self,
+        timestamp: Union[datetime, int],
+        level: str,
+        message: str,
+        rule_name: Optional[str] = None,
+        file_path: Optional[str] = None,
+        action_name: Optional[str] = None,
+    ):
+        """
+        Initialize a log entry.
+        
+        Args:
+            timestamp: Time of the entry, as a datetime or epoch nanoseconds
+            level: Log level
+            message: Log message
+            rule_name: Name of the rule that produced the entry
+            file_path: File the entry refers to
+            action_name: Action that produced the entry
+        """
+        self.timestamp_ns = _to_ns(timestamp)
+        self.level = level
+        self.level_id = _LEVEL_IDS.get(level, LEVEL_OTHER)
+        self.message = message
+        self.rule_name = rule_name
+        self.file_path = file_path
+        self.action_name = action_name
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Time of the entry as a local datetime, built on demand."""
+        seconds, ns = divmod(self.timestamp_ns, _NS_PER_SECOND)
+        return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000)
+    
+    def format_time(self, fmt: str) -> str:
+        """
+        Format the local time of the entry without creating a datetime.
+        
+        Args:
+            fmt: time.strftime format string
+            
+        Returns:
+            Formatted timestamp
+        """
+        return time.strftime(fmt, time.localtime(self.timestamp_ns // _NS_PER_SECOND))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -52,15 +145,24 @@ class LogEntry:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExecutionResult:
     """Result of an execution run."""
-    success_count: int = 0
-    error_count: int = 0
     skipped_count: int = 0
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     logs: List[LogEntry] = field(default_factory=list)
+    level_counts: List[int] = field(default_factory=lambda: [0] * (LEVEL_OTHER + 1))
+    
+    @property
+    def success_count(self) -> int:
+        """Get the number of success log entries."""
+        return self.level_counts[LEVEL_SUCCESS]
+    
+    @property
+    def error_count(self) -> int:
+        """Get the number of error log entries."""
+        return self.level_counts[LEVEL_ERROR]
     
     @property
     def duration(self) -> float:
@@ -75,6 +177,58 @@ class ExecutionResult:
         return self.success_count + self.error_count + self.skipped_count
 
 
+def write_log_entries(entries: Iterable[LogEntry], path: Path, format: str = "txt") -> None:
+    """
+    Write log entries to a file, streaming them through a large buffer.
+    
+    Args:
+        entries: Entries to write, in order
+        path: Output file path
+        format: Export format (txt, json, csv)
+    
+    Raises:
+        OSError: If the file cannot be written
+    """
+    if format == "txt":
+        # Write line by line through a large buffer rather than
+        # joining every formatted line into one string first
+        with open(path, "w", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
+            write = f.write
+            separator = ""
+            for entry in entries:
+                write(
+                    f"{separator}[{entry.format_time('%Y-%m-%d %H:%M:%S')}] "
+                    f"[{entry.level.upper()}] {entry.message}"
+                )
+                separator = "\n"
+    
+    elif format == "json":
+        # Same layout as json.dumps(list, indent=2, ensure_ascii=False),
+        # one entry at a time
+        with open(path, "w", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
+            write = f.write
+            separator = "[\n  "
+            for entry in entries:
+                write(separator)
+                write(_dumps_indented(entry.to_dict()).replace("\n", "\n  "))
+                separator = ",\n  "
+            write("[]" if separator == "[\n  " else "\n]")
+    
+    elif format == "csv":
+        with open(path, "w", newline="", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(["Timestamp", "Level", "Message", "Rule", "File", "Action"])
+            for entry in entries:
+                writer.writerow([
+                    entry.timestamp.isoformat(),
+                    entry.level,
+                    entry.message,
+                    entry.rule_name or "",
+                    entry.file_path or "",
+                    entry.action_name or "",
+                ])
+
+
 class GuiOutput(Output):
     """
     Custom output handler for the GUI application.
@@ -85,6 +239,7 @@ class GuiOutput(Output):
         self,
         on_msg: Optional[Callable[[LogEntry], None]] = None,
         on_progress: Optional[Callable[[str, int, int], None]] = None,
+        min_level: str = "debug",
     ):
         """
         Initialize GUI output handler.
@@ -92,9 +247,11 @@ class GuiOutput(Output):
         Args:
             on_msg: Callback for log messages
             on_progress: Callback for progress updates (rule_name, current, total)
+            min_level: Lowest level that produces a log entry
         """
         self._on_msg = on_msg
         self._on_progress = on_progress
+        self._min_level = _LEVEL_ORDER.get(min_level, _DEBUG_LEVEL)
         self._simulate = False
         self._current_rule = ""
         self._processed = 0
@@ -109,9 +266,10 @@ class GuiOutput(Output):
         self._simulate = simulate
         mode = "Simulating" if simulate else "Running"
         self._log("info", f"{mode} organize rules...")
-        if config_path:
-            self._log("debug", f"Config: {config_path}")
-        self._log("debug", f"Working directory: {working_dir}")
+        if self._min_level <= _DEBUG_LEVEL:
+            if config_path:
+                self._log("debug", f"Config: {config_path}")
+            self._log("debug", f"Working directory: {working_dir}")
     
     def end(self, success: int, errors: int) -> None:
         """Called when execution ends."""
@@ -128,6 +286,8 @@ class GuiOutput(Output):
         sender: Any = None,
     ) -> None:
         """Called for each log message."""
+        if _LEVEL_ORDER.get(level, 20) < self._min_level:
+            return
         file_path = str(res.path) if res.path else None
         action_name = sender.action_config.name if sender and hasattr(sender, "action_config") else None
         rule_name = res.rule.name if res.rule and hasattr(res.rule, "name") else None
@@ -149,13 +309,15 @@ class GuiOutput(Output):
         action_name: Optional[str] = None,
     ) -> None:
         """Create and emit a log entry."""
+        if _LEVEL_ORDER.get(level, 20) < self._min_level:
+            return
         entry = LogEntry(
-            timestamp=datetime.now(),
-            level=level,
-            message=message,
-            rule_name=rule_name,
-            file_path=file_path,
-            action_name=action_name,
+            time.time_ns(),
+            level,
+            message,
+            rule_name,
+            file_path,
+            action_name,
         )
         
         if self._on_msg:
@@ -173,13 +335,23 @@ class RuleEngine:
     - Log collection
     """
     
-    def __init__(self):
-        """Initialize the rule engine."""
+    def __init__(self, max_log_entries: Optional[int] = None, queue_logs: bool = False):
+        """
+        Initialize the rule engine.
+        
+        Args:
+            max_log_entries: Number of most recent log entries to keep,
+                or None to keep all of them
+            queue_logs: Hand new log entries to a queue drained with
+                drain_logs() instead of calling on_log for each one
+        """
         self._status = ExecutionStatus.IDLE
         self._thread: Optional[threading.Thread] = None
         self._cancel_event = threading.Event()
         self._result = ExecutionResult()
-        self._logs: List[LogEntry] = []
+        self._logs: Deque[LogEntry] = deque(maxlen=max_log_entries)
+        self._min_log_level = "debug"
+        self._log_queue: Optional[queue.SimpleQueue] = queue.SimpleQueue() if queue_logs else None
         
         # Callbacks
         self._on_status_change: Optional[Callable[[ExecutionStatus], None]] = None
@@ -203,10 +375,57 @@ class RuleEngine:
         return self._result
     
     @property
-    def logs(self) -> List[LogEntry]:
-        """Get all log entries."""
+    def logs(self) -> Deque[LogEntry]:
+        """Get the retained log entries, oldest first."""
         return self._logs
     
+    def drain_logs(self, max_entries: int = 256) -> List[LogEntry]:
+        """
+        Take pending log entries queued by the worker thread.
+        
+        Only used when the engine was created with queue_logs=True; lets
+        the GUI pick up log entries in batches on its own thread.
+        
+        Args:
+            max_entries: Maximum number of entries to return
+            
+        Returns:
+            Pending entries in the order they were logged
+        """
+        entries: List[LogEntry] = []
+        if self._log_queue is None:
+            return entries
+        
+        get = self._log_queue.get_nowait
+        while len(entries) < max_entries:
+            try:
+                entries.append(get())
+            except queue.Empty:
+                break
+        return entries
+    
+    def set_max_log_entries(self, max_log_entries: Optional[int]) -> None:
+        """
+        Change how many log entries are retained.
+        
+        Args:
+            max_log_entries: Number of most recent entries to keep, or None for all
+        """
+        if max_log_entries != self._logs.maxlen:
+            self._logs = deque(self._logs, maxlen=max_log_entries)
+    
+    def set_min_log_level(self, level: str) -> None:
+        """
+        Set the lowest log level that is recorded.
+        
+        Messages below this level are dropped before a LogEntry is built.
+        Takes effect on the next run.
+        
+        Args:
+            level: One of debug, info, success, warning, error
+        """
+        self._min_log_level = level if level in _LEVEL_ORDER else "debug"
+    
     def set_callbacks(
         self,
         on_status_change: Optional[Callable[[ExecutionStatus], None]] = None,
@@ -246,19 +465,7 @@ class RuleEngine:
             skip_tags: Tags to exclude
             working_dir: Working directory
         """
-        if self.is_running:
-            return
-        
-        self._cancel_event.clear()
-        self._logs = []
-        self._result = ExecutionResult(start_time=datetime.now())
-        
-        self._thread = threading.Thread(
-            target=self._execute,
-            args=(config, simulate, tags or set(), skip_tags or set(), working_dir),
-            daemon=True,
-        )
-        self._thread.start()
+        self._start(self._execute, config, simulate, tags, skip_tags, working_dir)
     
     def run_from_string(
         self,
@@ -272,6 +479,9 @@ class RuleEngine:
         """
         Start executing rules from a config string.
         
+        The config is parsed on the worker thread as well, so a large
+        config does not block the caller.
+        
         Args:
             config_string: YAML config content
             config_path: Optional config file path
@@ -280,16 +490,94 @@ class RuleEngine:
             skip_tags: Tags to exclude
             working_dir: Working directory
         """
+        self._start(
+            self._parse_and_execute,
+            (config_string, config_path), simulate, tags, skip_tags, working_dir,
+        )
+    
+    def run_from_obj(
+        self,
+        config: Dict[str, Any],
+        config_path: Optional[Path] = None,
+        simulate: bool = True,
+        tags: Optional[Set[str]] = None,
+        skip_tags: Optional[Set[str]] = None,
+        working_dir: Optional[Path] = None,
+    ) -> None:
+        """
+        Start executing rules from an already-parsed config dictionary.
+        
+        Skips the YAML round trip when the rules come from the visual
+        editor; the Config is still built on the worker thread.
+        
+        Args:
+            config: Config dictionary, e.g. {"rules": [...]}
+            config_path: Optional config file path
+            simulate: Whether to simulate
+            tags: Tags to include
+            skip_tags: Tags to exclude
+            working_dir: Working directory
+        """
+        self._start(
+            self._parse_and_execute,
+            (config, config_path), simulate, tags, skip_tags, working_dir,
+        )
+    
+    def _start(
+        self,
+        target: Callable[..., None],
+        config: Any,
+        simulate: bool,
+        tags: Optional[Set[str]],
+        skip_tags: Optional[Set[str]],
+        working_dir: Optional[Path],
+    ) -> None:
+        """Reset the run state and start target on a worker thread."""
+        if self.is_running:
+            return
+        
+        self._cancel_event.clear()
+        self._logs = deque(maxlen=self._logs.maxlen)
+        self._result = ExecutionResult(start_time=datetime.now())
+        
+        # Report the run as started before the thread is scheduled, so a
+        # second request in the meantime is ignored
+        self._set_status(ExecutionStatus.RUNNING)
+        
+        self._thread = threading.Thread(
+            target=target,
+            args=(config, simulate, tags or set(), skip_tags or set(), working_dir),
+            daemon=True,
+        )
+        self._thread.start()
+    
+    def _parse_and_execute(
+        self,
+        source: Tuple[Union[str, Dict[str, Any]], Optional[Path]],
+        simulate: bool,
+        tags: Set[str],
+        skip_tags: Set[str],
+        working_dir: Optional[Path],
+    ) -> None:
+        """Build a Config from a (string or dict, config path) pair and execute it."""
+        config_data, config_path = source
         try:
-            config = Config.from_string(config=config_string, config_path=config_path)
-            self.run(config, simulate, tags, skip_tags, working_dir)
+            if isinstance(config_data, str):
+                config = Config.from_string(config=config_data, config_path=config_path)
+            else:
+                config = config_from_obj(config_data, config_path=config_path)
         except Exception as e:
             self._log_entry(LogEntry(
-                timestamp=datetime.now(),
+                timestamp=time.time_ns(),
                 level="error",
                 message=f"Failed to parse config: {e}",
             ))
+            self._result.end_time = datetime.now()
+            self._result.logs = list(self._logs)
             self._set_status(ExecutionStatus.FAILED)
+            return
+        
+        self._execute(config, simulate, tags, skip_tags, working_dir)
     
     def cancel(self) -> None:
         """Cancel the current execution."""
@@ -299,7 +587,7 @@ class RuleEngine:
     
     def clear_logs(self) -> None:
         """Clear all log entries."""
-        self._logs = []
+        self._logs = deque(maxlen=self._logs.maxlen)
     
     def _execute(
         self,
@@ -310,13 +598,12 @@ class RuleEngine:
         working_dir: Optional[Path],
     ) -> None:
         """Execute rules in a separate thread."""
-        self._set_status(ExecutionStatus.RUNNING)
-        
         try:
             # Create custom output handler
             output = GuiOutput(
                 on_msg=self._log_entry,
                 on_progress=self._on_progress,
+                min_level=self._min_log_level,
             )
             
             # Set working directory
@@ -338,7 +625,7 @@ class RuleEngine:
                 
         except Exception as e:
             self._log_entry(LogEntry(
-                timestamp=datetime.now(),
+                timestamp=time.time_ns(),
                 level="error",
                 message=f"Execution failed: {e}",
             ))
@@ -346,7 +633,7 @@ class RuleEngine:
         
         finally:
             self._result.end_time = datetime.now()
-            self._result.logs = self._logs.copy()
+            self._result.logs = list(self._logs)
             
             if self._on_complete:
                 self._on_complete(self._result)
@@ -359,15 +646,17 @@ class RuleEngine:
     
     def _log_entry(self, entry: LogEntry) -> None:
         """Add log entry and notify callback."""
+        if _LEVEL_ORDER.get(entry.level, 20) < _LEVEL_ORDER[self._min_log_level]:
+            return
+        
         self._logs.append(entry)
         
         # Update result counts
-        if entry.level == "error":
-            self._result.error_count += 1
-        elif entry.level == "success":
-            self._result.success_count += 1
+        self._result.level_counts[entry.level_id] += 1
         
-        if self._on_log:
+        if self._log_queue is not None:
+            self._log_queue.put_nowait(entry)
+        elif self._on_log:
             self._on_log(entry)
     
     def export_logs(self, path: Path, format: str = "txt") -> bool:
@@ -382,33 +671,7 @@ class RuleEngine:
             True if successful
         """
         try:
-            if format == "txt":
-                lines = []
-                for entry in self._logs:
-                    timestamp = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    lines.append(f"[{timestamp}] [{entry.level.upper()}] {entry.message}")
-                path.write_text("\n".join(lines), encoding="utf-8")
-                
-            elif format == "json":
-                import json
-                data = [entry.to_dict() for entry in self._logs]
-                path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-                
-            elif format == "csv":
-                import csv
-                with open(path, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Timestamp", "Level", "Message", "Rule", "File", "Action"])
-                    for entry in self._logs:
-                        writer.writerow([
-                            entry.timestamp.isoformat(),
-                            entry.level,
-                            entry.message,
-                            entry.rule_name or "",
-                            entry.file_path or "",
-                            entry.action_name or "",
-                        ])
-            
+            write_log_entries(self._logs, path, format)
             return True
         except Exception:
             return False
@@ -2,15 +2,86 @@
 Application settings management using platformdirs for cross-platform paths.
 """
 
+import sys
 import json
+import atexit
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, List
-from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Optional, List, Set
+from dataclasses import dataclass, field, fields
 
 import platformdirs
 
+from ..utils.helpers import write_file_atomic
 
-@dataclass
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup, fall back to the standard library
+    # orjson writes non-ASCII text as is; match it so output is the same
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    _json_loads = json.loads
+
+# dataclass(slots=True) needs Python 3.10+; older versions keep a __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# platformdirs lookups never change within a process, so resolve them once
+@lru_cache(maxsize=8)
+def _user_config_path(app_name: str) -> Path:
+    """Get the cached user config directory for an application."""
+    return platformdirs.user_config_path(appname=app_name)
+
+
+@lru_cache(maxsize=8)
+def _user_log_path(app_name: str) -> Path:
+    """Get the cached user log directory for an application."""
+    return platformdirs.user_log_path(appname=app_name)
+
+
+@lru_cache(maxsize=8)
+def _user_data_path(app_name: str) -> Path:
+    """Get the cached user data directory for an application."""
+    return platformdirs.user_data_path(appname=app_name)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple:
+    """Get the public field names of a settings dataclass."""
+    return tuple(f.name for f in fields(cls) if not f.name.startswith("_"))
+
+
+def _to_dict(obj: Any) -> Dict[str, Any]:
+    """
+    Convert a flat settings dataclass to a dict for serialization.
+    
+    Unlike dataclasses.asdict this does not deep-copy the field values,
+    which are all plain JSON types here.
+    """
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+
+# Directories already created by this process
+_ENSURED_DIRS: Set[Path] = set()
+
+
+def _ensure_dir(path: Path) -> Path:
+    """Create a directory once per process and return it."""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
+
+
+@dataclass(**_SLOTS)
 class UISettings:
     """User interface settings."""
     theme: str = "dark"  # dark, light, system
@@ -25,7 +96,7 @@ class UISettings:
     show_welcome_screen: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RunSettings:
     """Settings for running organize rules."""
     simulate_by_default: bool = True
@@ -35,7 +106,7 @@ class RunSettings:
     clear_log_on_run: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EditorSettings:
     """Code editor settings."""
     editor_font_family: str = "Consolas"
@@ -50,7 +121,7 @@ class EditorSettings:
     bracket_matching: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RecentFile:
     """Recent config file entry."""
     path: str
@@ -58,27 +129,51 @@ class RecentFile:
     last_accessed: str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Settings:
     """Main application settings."""
     ui: UISettings = field(default_factory=UISettings)
     run: RunSettings = field(default_factory=RunSettings)
     editor: EditorSettings = field(default_factory=EditorSettings)
-    recent_files: List[Dict[str, str]] = field(default_factory=list)
     pinned_locations: List[str] = field(default_factory=list)
     last_config_path: str = ""
     window_geometry: Dict[str, int] = field(default_factory=dict)
     
     _app_name: str = field(default="organize-desktop", repr=False)
     _settings_path: Optional[Path] = field(default=None, repr=False)
+    _recent_files: "OrderedDict[str, Dict[str, str]]" = field(default_factory=OrderedDict, repr=False)
+    _dirty: bool = field(default=False, repr=False, compare=False)
+    _flush_timer: Optional[threading.Timer] = field(default=None, repr=False, compare=False)
+    # Deferred saves run on a timer thread; this serializes them with the
+    # GUI thread's saves and with changes to the recent and pinned lists
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    
+    # Seconds to wait after a change before writing it to disk
+    SAVE_DELAY = 2.0
+    
+    # Number of entries kept in the recent files list
+    MAX_RECENT_FILES = 10
     
     def __post_init__(self):
         """Initialize settings path after creation."""
         if self._settings_path is None:
-            config_dir = platformdirs.user_config_path(appname=self._app_name)
-            config_dir.mkdir(parents=True, exist_ok=True)
+            config_dir = _ensure_dir(_user_config_path(self._app_name))
             self._settings_path = config_dir / "settings.json"
     
+    @property
+    def recent_files(self) -> List[Dict[str, str]]:
+        """Recent files, most recently used first."""
+        return list(self._recent_files.values())
+    
+    @recent_files.setter
+    def recent_files(self, files: List[Dict[str, str]]) -> None:
+        """Replace the recent files list."""
+        recent = OrderedDict(
+            (entry.get("path", ""), entry) for entry in files[:self.MAX_RECENT_FILES]
+        )
+        with self._lock:
+            self._recent_files = recent
+    
     @classmethod
     def load(cls, app_name: str = "organize-desktop") -> "Settings":
         """
@@ -90,7 +185,7 @@ class Settings:
         Returns:
             Settings instance
         """
-        config_dir = platformdirs.user_config_path(appname=app_name)
+        config_dir = _user_config_path(app_name)
         settings_path = config_dir / "settings.json"
         
         if not settings_path.exists():
@@ -99,8 +194,7 @@ class Settings:
             return settings
         
         try:
-            with open(settings_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _json_loads(settings_path.read_bytes())
             
             # Parse nested dataclasses
             ui = UISettings(**data.get("ui", {}))
@@ -111,13 +205,13 @@ class Settings:
                 ui=ui,
                 run=run,
                 editor=editor,
-                recent_files=data.get("recent_files", []),
                 pinned_locations=data.get("pinned_locations", []),
                 last_config_path=data.get("last_config_path", ""),
                 window_geometry=data.get("window_geometry", {}),
                 _app_name=app_name,
             )
             settings._settings_path = settings_path
+            settings.recent_files = data.get("recent_files", [])
             return settings
         except (json.JSONDecodeError, TypeError, KeyError):
             # Return default settings if loading fails
@@ -125,31 +219,79 @@ class Settings:
             settings._settings_path = settings_path
             return settings
     
-    def save(self) -> bool:
+    def save(self, sync: bool = True) -> bool:
         """
         Save settings to disk.
         
+        Args:
+            sync: fsync the written file; deferred saves skip this
+            
         Returns:
             True if successful, False otherwise
         """
-        try:
-            self._settings_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._cancel_flush()
+            try:
+                self._settings_path.parent.mkdir(parents=True, exist_ok=True)
+                
+                data = {
+                    "ui": _to_dict(self.ui),
+                    "run": _to_dict(self.run),
+                    "editor": _to_dict(self.editor),
+                    "recent_files": self.recent_files,
+                    "pinned_locations": self.pinned_locations,
+                    "last_config_path": self.last_config_path,
+                    "window_geometry": self.window_geometry,
+                }
+                
+                write_file_atomic(self._settings_path, _json_dumps(data), sync=sync)
+            except Exception:
+                # Keep the change pending so the exit flush retries it
+                self._dirty = True
+                atexit.register(self.flush)
+                return False
             
-            data = {
-                "ui": asdict(self.ui),
-                "run": asdict(self.run),
-                "editor": asdict(self.editor),
-                "recent_files": self.recent_files,
-                "pinned_locations": self.pinned_locations,
-                "last_config_path": self.last_config_path,
-                "window_geometry": self.window_geometry,
-            }
-            
-            with open(self._settings_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            self._dirty = False
             return True
-        except Exception:
-            return False
+    
+    def mark_dirty(self) -> None:
+        """
+        Record an unsaved change and schedule a deferred save.
+        
+        Bursts of changes are coalesced into a single write after
+        SAVE_DELAY seconds; pending changes are also written at exit.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._flush_timer is not None:
+                return
+            
+            timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            timer.daemon = True
+            self._flush_timer = timer
+            atexit.register(self.flush)
+            timer.start()
+    
+    def flush(self) -> bool:
+        """
+        Write pending changes to disk, if there are any.
+        
+        Returns:
+            True if nothing was pending or the save succeeded
+        """
+        with self._lock:
+            self._cancel_flush()
+            if not self._dirty:
+                return True
+            return self.save(sync=False)
+    
+    def _cancel_flush(self) -> None:
+        """Cancel a scheduled deferred save or a pending exit flush."""
+        timer = self._flush_timer
+        self._flush_timer = None
+        if timer is not None:
+            timer.cancel()
+        atexit.unregister(self.flush)
     
     def add_recent_file(self, path: str, name: str = "") -> None:
         """
@@ -164,24 +306,27 @@ class Settings:
         if not name:
             name = Path(path).name
         
-        # Remove existing entry if present
-        self.recent_files = [f for f in self.recent_files if f.get("path") != path]
-        
-        # Add to beginning
-        self.recent_files.insert(0, {
-            "path": path,
-            "name": name,
-            "last_accessed": datetime.now().isoformat(),
-        })
-        
-        # Keep only last 10
-        self.recent_files = self.recent_files[:10]
-        self.save()
+        with self._lock:
+            # Replace any existing entry and move it to the front
+            recent = self._recent_files
+            recent.pop(path, None)
+            recent[path] = {
+                "path": path,
+                "name": name,
+                "last_accessed": datetime.now().isoformat(),
+            }
+            recent.move_to_end(path, last=False)
+            
+            # Keep only the most recent entries
+            while len(recent) > self.MAX_RECENT_FILES:
+                recent.popitem(last=True)
+            self.mark_dirty()
     
     def clear_recent_files(self) -> None:
         """Clear the recent files list."""
-        self.recent_files = []
-        self.save()
+        with self._lock:
+            self._recent_files.clear()
+            self.mark_dirty()
     
     def add_pinned_location(self, path: str) -> None:
         """
@@ -190,9 +335,10 @@ class Settings:
         Args:
             path: Location path
         """
-        if path not in self.pinned_locations:
-            self.pinned_locations.append(path)
-            self.save()
+        with self._lock:
+            if path not in self.pinned_locations:
+                self.pinned_locations.append(path)
+                self.mark_dirty()
     
     def remove_pinned_location(self, path: str) -> None:
         """
@@ -201,29 +347,26 @@ class Settings:
         Args:
             path: Location path
         """
-        if path in self.pinned_locations:
-            self.pinned_locations.remove(path)
-            self.save()
+        with self._lock:
+            if path in self.pinned_locations:
+                self.pinned_locations.remove(path)
+                self.mark_dirty()
     
     def get_configs_dir(self) -> Path:
         """Get the directory where organize configs are stored."""
-        return platformdirs.user_config_path(appname="organize")
+        return _user_config_path("organize")
     
     def get_logs_dir(self) -> Path:
         """Get the directory for log files."""
-        log_dir = platformdirs.user_log_path(appname=self._app_name)
-        log_dir.mkdir(parents=True, exist_ok=True)
-        return log_dir
+        return _ensure_dir(_user_log_path(self._app_name))
     
     def get_data_dir(self) -> Path:
         """Get the directory for application data."""
-        data_dir = platformdirs.user_data_path(appname=self._app_name)
-        data_dir.mkdir(parents=True, exist_ok=True)
-        return data_dir
+        return _ensure_dir(_user_data_path(self._app_name))
     
     def reset_to_defaults(self) -> None:
         """Reset all settings to defaults."""
         self.ui = UISettings()
         self.run = RunSettings()
         self.editor = EditorSettings()
-        self.save()
+        self.mark_dirty()
@@ -9,12 +9,20 @@ import sys
 import os
 from pathlib import Path
 
+# Add parent directory to path if needed (for direct script execution)
+_PARENT_DIR = str(Path(__file__).parent.parent)
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
+
+# These need the path set up above, and stay at module level so freezers
+# such as PyInstaller can see them
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from app.ui.main_window import MainWindow  # noqa: E402
+
 
 def setup_environment():
     """Set up environment for the application."""
-    # Enable High DPI scaling
-    os.environ.setdefault("QT_AUTO_SCREEN_SCALE_FACTOR", "1")
-    
     # Set application info for Qt
     os.environ.setdefault("QT_QPA_PLATFORM", "")  # Let Qt auto-detect
 
@@ -23,16 +31,6 @@ def main():
     """Main entry point for the application."""
     setup_environment()
     
-    # Add parent directory to path if needed (for direct script execution)
-    app_dir = Path(__file__).parent
-    parent_dir = str(app_dir.parent)
-    if parent_dir not in sys.path:
-        sys.path.insert(0, parent_dir)
-    
-    from PyQt6.QtWidgets import QApplication
-    from PyQt6.QtCore import Qt
-    from PyQt6.QtGui import QIcon
-    
     # Create application
     app = QApplication(sys.argv)
     app.setApplicationName("Organize Desktop")
@@ -43,9 +41,7 @@ def main():
     # Set application style
     app.setStyle("Fusion")
     
-    # Import and create main window
-    from app.ui.main_window import MainWindow
-    
+    # Create main window
     window = MainWindow()
     window.show()
     
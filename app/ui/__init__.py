@@ -1,13 +1,20 @@
 """
 UI module containing all graphical user interface components.
+
+Submodules are imported on first attribute access, so dialogs and editors
+that are not needed at startup are only loaded when first used.
 """
 
-from .main_window import MainWindow
-from .rule_editor import RuleEditor
-from .config_editor import ConfigEditor
-from .log_viewer import LogViewer
-from .settings_dialog import SettingsDialog
-from .styles import StyleManager
+from importlib import import_module
+
+_EXPORTS = {
+    "MainWindow": ".main_window",
+    "RuleEditor": ".rule_editor",
+    "ConfigEditor": ".config_editor",
+    "LogViewer": ".log_viewer",
+    "SettingsDialog": ".settings_dialog",
+    "StyleManager": ".styles",
+}
 
 __all__ = [
     "MainWindow",
@@ -17,3 +24,12 @@ __all__ = [
     "SettingsDialog",
     "StyleManager",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -2,21 +2,77 @@
 YAML configuration editor with syntax highlighting.
 """
 
-from typing import Optional
+from typing import Optional, Dict
 
+import yaml
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QLabel,
     QFrame, QPushButton, QToolButton, QSizePolicy, QTextEdit,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRegularExpression
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRegularExpression, QEvent
 from PyQt6.QtGui import (
     QFont, QFontMetrics, QSyntaxHighlighter, QTextDocument,
-    QTextCharFormat, QColor, QPainter, QTextFormat,
+    QTextCharFormat, QColor, QPainter, QTextFormat, QStaticText, QTransform,
 )
 
+from ..core.config_manager import _Loader
 from .styles import StyleManager
 
 
+# Line number labels for files up to this many lines, built once
+_NUM_STRINGS = tuple(str(i) for i in range(10_001))
+
+
+def _number_string(number: int) -> str:
+    """Get the label text for a line number."""
+    return _NUM_STRINGS[number] if number < len(_NUM_STRINGS) else str(number)
+
+
+def _compile(
+    pattern: str,
+    options=QRegularExpression.PatternOption.NoPatternOption,
+) -> QRegularExpression:
+    """Compile a highlighting pattern up front so it is not parsed on first use."""
+    regex = QRegularExpression(pattern, options)
+    regex.optimize()
+    return regex
+
+
+# (role, pattern) alternatives of the single-pass YAML scanner. At any
+# position the first alternative that matches wins, so keys come before
+# strings and strings before the tokens they may contain. The patterns
+# must not contain capturing groups of their own.
+_YAML_TOKENS = (
+    # Keys (before colon)
+    ("key", r"^\s*[\w\-]+(?=\s*:)"),
+    ("key", r"^\s*\"[^\"]+\"(?=\s*:)"),
+    ("key", r"^\s*'[^']+'(?=\s*:)"),
+    # List markers
+    ("list", r"^\s*-\s"),
+    # String values (double and single quotes)
+    ("string", r'"[^"]*"'),
+    ("string", r"'[^']*'"),
+    # Anchors and aliases
+    ("anchor", r"[&*]\w+"),
+    # Booleans
+    ("bool", r"\b(?i:true|false|yes|no|null|~)\b"),
+    # Numbers
+    ("number", r"\b\d+\.?\d*\b"),
+)
+
+# One regex with a capturing group per alternative; the group that captured
+# (lastCapturedIndex) identifies the token role
+_YAML_SCANNER = _compile("|".join(f"({pattern})" for _, pattern in _YAML_TOKENS))
+
+# Comments are applied over the scanner's tokens, so a quote inside a
+# comment (e.g. "key: it's # note 'x") cannot swallow part of it
+_COMMENT_PATTERN = _compile(r"#.*$")
+
+# Template variables are highlighted in a final pass so they stand out
+# inside strings as well
+_TEMPLATE_PATTERN = _compile(r"\{[^}]+\}")
+
+
 class YAMLHighlighter(QSyntaxHighlighter):
     """Syntax highlighter for YAML content."""
     
@@ -24,69 +80,57 @@ class YAMLHighlighter(QSyntaxHighlighter):
         """Initialize the highlighter."""
         super().__init__(document)
         self.style_manager = style_manager
-        self._setup_rules()
+        self._refresh_formats()
     
-    def _setup_rules(self) -> None:
-        """Set up highlighting rules."""
-        self.rules = []
+    def _refresh_formats(self) -> None:
+        """Build the theme-dependent formats for the shared highlighting patterns."""
         colors = self.style_manager.colors
         
-        # Key format (before colon)
-        key_format = QTextCharFormat()
-        key_format.setForeground(QColor(colors["primary"]))
-        key_format.setFontWeight(600)
-        self.rules.append((QRegularExpression(r"^\s*[\w\-]+(?=\s*:)"), key_format))
-        self.rules.append((QRegularExpression(r"^\s*\"[^\"]+\"(?=\s*:)"), key_format))
-        self.rules.append((QRegularExpression(r"^\s*'[^']+'(?=\s*:)"), key_format))
-        
-        # String values (double quotes)
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor(colors["success"]))
-        self.rules.append((QRegularExpression(r'"[^"]*"'), string_format))
-        
-        # String values (single quotes)
-        self.rules.append((QRegularExpression(r"'[^']*'"), string_format))
-        
-        # Numbers
-        number_format = QTextCharFormat()
-        number_format.setForeground(QColor(colors["warning"]))
-        self.rules.append((QRegularExpression(r"\b\d+\.?\d*\b"), number_format))
-        
-        # Booleans
-        bool_format = QTextCharFormat()
-        bool_format.setForeground(QColor(colors["secondary"]))
-        self.rules.append((QRegularExpression(r"\b(true|false|yes|no|null|~)\b", 
-                                               QRegularExpression.PatternOption.CaseInsensitiveOption), 
-                          bool_format))
-        
-        # Comments
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor(colors["text_disabled"]))
-        comment_format.setFontItalic(True)
-        self.rules.append((QRegularExpression(r"#.*$"), comment_format))
-        
-        # List markers
-        list_format = QTextCharFormat()
-        list_format.setForeground(QColor(colors["accent"]))
-        self.rules.append((QRegularExpression(r"^\s*-\s"), list_format))
-        
-        # Anchors and aliases
-        anchor_format = QTextCharFormat()
-        anchor_format.setForeground(QColor(colors["secondary"]))
-        self.rules.append((QRegularExpression(r"[&*]\w+"), anchor_format))
-        
-        # Template variables
-        template_format = QTextCharFormat()
-        template_format.setForeground(QColor(colors["primary_variant"]))
-        self.rules.append((QRegularExpression(r"\{[^}]+\}"), template_format))
+        def make_format(color: str) -> QTextCharFormat:
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(colors[color]))
+            return text_format
+        
+        formats = {
+            "key": make_format("primary"),
+            "string": make_format("success"),
+            "number": make_format("warning"),
+            "bool": make_format("secondary"),
+            "comment": make_format("text_disabled"),
+            "list": make_format("accent"),
+            "anchor": make_format("secondary"),
+            "template": make_format("primary_variant"),
+        }
+        formats["key"].setFontWeight(600)
+        formats["comment"].setFontItalic(True)
+        
+        # Indexed by capture group number - 1
+        self._token_formats = tuple(formats[role] for role, _ in _YAML_TOKENS)
+        self._comment_format = formats["comment"]
+        self._template_format = formats["template"]
     
     def highlightBlock(self, text: str) -> None:
         """Apply highlighting to a block of text."""
-        for pattern, format in self.rules:
-            match_iterator = pattern.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), format)
+        token_formats = self._token_formats
+        match_iterator = _YAML_SCANNER.globalMatch(text)
+        while match_iterator.hasNext():
+            match = match_iterator.next()
+            self.setFormat(
+                match.capturedStart(),
+                match.capturedLength(),
+                token_formats[match.lastCapturedIndex() - 1],
+            )
+        
+        # A line holds at most one comment, and most hold none
+        if "#" in text:
+            match = _COMMENT_PATTERN.match(text)
+            if match.hasMatch():
+                self.setFormat(match.capturedStart(), match.capturedLength(), self._comment_format)
+        
+        match_iterator = _TEMPLATE_PATTERN.globalMatch(text)
+        while match_iterator.hasNext():
+            match = match_iterator.next()
+            self.setFormat(match.capturedStart(), match.capturedLength(), self._template_format)
 
 
 class LineNumberArea(QWidget):
@@ -131,6 +175,15 @@ class YAMLEditor(QPlainTextEdit):
         # Line number area
         self.line_number_area = LineNumberArea(self)
         
+        # Pre-laid-out line number labels, keyed by line number
+        self._static_numbers: Dict[int, QStaticText] = {}
+        
+        # Line number area width only changes with the number of digits
+        # and the font (see refresh_font_metrics)
+        self._number_digits = 0
+        self._number_area_width = 0
+        self._margin_width = -1
+        
         # Highlighter
         self.highlighter = YAMLHighlighter(self.document(), style_manager)
         
@@ -159,11 +212,9 @@ class YAMLEditor(QPlainTextEdit):
     
     def line_number_area_width(self) -> int:
         """Calculate the width needed for line numbers."""
-        digits = 1
-        max_num = max(1, self.blockCount())
-        while max_num >= 10:
-            max_num //= 10
-            digits += 1
+        digits = len(_number_string(max(1, self.blockCount())))
+        if digits == self._number_digits:
+            return self._number_area_width
         
         metrics = QFontMetrics(self.font())
         try:
@@ -171,11 +222,53 @@ class YAMLEditor(QPlainTextEdit):
         except AttributeError:
             char_width = metrics.width('9')
         
-        return 20 + char_width * digits
+        self._number_digits = digits
+        self._number_area_width = 20 + char_width * digits
+        return self._number_area_width
+    
+    def refresh_font_metrics(self) -> None:
+        """Drop the gutter width and labels measured with the previous font."""
+        self._number_digits = 0
+        self._static_numbers = {}
+        self.update_line_number_area_width(0)
+        cr = self.contentsRect()
+        self.line_number_area.setGeometry(
+            cr.left(), cr.top(),
+            self.line_number_area_width(), cr.height()
+        )
+        self.line_number_area.update()
+    
+    def changeEvent(self, event) -> None:
+        """Re-measure line numbers when the font changes, e.g. on polish."""
+        super().changeEvent(event)
+        # setFont() in __init__ gets here before the gutter exists
+        if event.type() == QEvent.Type.FontChange and hasattr(self, 'line_number_area'):
+            self.refresh_font_metrics()
     
     def update_line_number_area_width(self, _) -> None:
         """Update the margin for line numbers."""
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        width = self.line_number_area_width()
+        if width != self._margin_width:
+            self._margin_width = width
+            self.setViewportMargins(width, 0, 0, 0)
+        
+        # Drop cached labels for lines that no longer exist
+        block_count = self.blockCount()
+        if len(self._static_numbers) > block_count:
+            self._static_numbers = {
+                number: text for number, text in self._static_numbers.items()
+                if number <= block_count
+            }
+    
+    def _line_number_text(self, number: int) -> QStaticText:
+        """Get the cached, pre-laid-out label for a line number."""
+        text = self._static_numbers.get(number)
+        if text is None:
+            text = QStaticText(_number_string(number))
+            text.setTextFormat(Qt.TextFormat.PlainText)
+            text.prepare(QTransform(), self.font())
+            self._static_numbers[number] = text
+        return text
     
     def update_line_number_area(self, rect, dy) -> None:
         """Update the line number area on scroll."""
@@ -220,26 +313,33 @@ class YAMLEditor(QPlainTextEdit):
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
-        bottom = top + int(self.blockBoundingRect(block).height())
+        height = int(self.blockBoundingRect(block).height())
         
         painter.setPen(QColor(self.style_manager.colors["text_secondary"]))
         font = self.font()
         painter.setFont(font)
         
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
-                painter.drawText(
-                    0, top,
-                    self.line_number_area.width() - 10, 
-                    int(self.blockBoundingRect(block).height()),
-                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-                    number
+        # Loop invariants
+        rect_top = event.rect().top()
+        rect_bottom = event.rect().bottom()
+        number_right = self.line_number_area.width() - 10
+        
+        while block.isValid() and top <= rect_bottom:
+            bottom = top + height
+            if block.isVisible() and bottom >= rect_top:
+                # Right-aligned and vertically centred in the block
+                text = self._line_number_text(block_number + 1)
+                size = text.size()
+                painter.drawStaticText(
+                    int(number_right - size.width()),
+                    int(top + (height - size.height()) / 2),
+                    text,
                 )
             
             block = block.next()
             top = bottom
-            bottom = top + int(self.blockBoundingRect(block).height())
+            # Blocks can wrap onto several lines, so heights are not uniform
+            height = int(self.blockBoundingRect(block).height())
             block_number += 1
         
         painter.end()
@@ -253,11 +353,18 @@ class ConfigEditor(QWidget):
     
     content_changed = pyqtSignal(str)  # Emits the new content
     
+    # Bursts of edits within this window produce one content_changed
+    CHANGE_EMIT_DELAY_MS = 200
+    
     def __init__(self, style_manager: StyleManager, parent: Optional[QWidget] = None):
         """Initialize the config editor."""
         super().__init__(parent)
         self.style_manager = style_manager
         
+        # Last validated content and its parse error (None if valid)
+        self._validated_content: Optional[str] = None
+        self._validation_error: Optional[yaml.YAMLError] = None
+        
         self._setup_ui()
         self._setup_validation_timer()
     
@@ -308,6 +415,11 @@ class ConfigEditor(QWidget):
         self._validation_timer = QTimer()
         self._validation_timer.setSingleShot(True)
         self._validation_timer.timeout.connect(self._validate)
+        
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(self.CHANGE_EMIT_DELAY_MS)
+        self._emit_timer.timeout.connect(self._emit_content_changed)
     
     def set_content(self, content: str) -> None:
         """Set the editor content."""
@@ -334,11 +446,11 @@ class ConfigEditor(QWidget):
         self.editor.style_manager = style_manager
         self.editor._apply_style()
         self.editor.highlighter.style_manager = style_manager
-        self.editor.highlighter._setup_rules()
+        self.editor.highlighter._refresh_formats()
         self.editor.highlighter.rehighlight()
         
-        # Update line number area
-        self.editor.line_number_area.update()
+        # Update line number area; the new stylesheet may change the font
+        self.editor.refresh_font_metrics()
         
         # Find and update status bar
         for child in self.children():
@@ -361,22 +473,44 @@ class ConfigEditor(QWidget):
         # Debounce validation
         self._validation_timer.start(500)
         
-        # Emit change signal
+        # Coalesce change signals while typing or pasting
+        self._emit_timer.start()
+    
+    def flush_pending_changes(self) -> None:
+        """Emit a pending content_changed right away, if there is one."""
+        if self._emit_timer.isActive():
+            self._emit_timer.stop()
+            self._emit_content_changed()
+    
+    def _emit_content_changed(self) -> None:
+        """Emit the current content."""
         self.content_changed.emit(self.get_content())
     
     def _validate(self) -> None:
         """Validate the YAML content."""
-        import yaml
-        
         content = self.get_content()
         
-        try:
-            yaml.safe_load(content)
+        # Re-validating identical content (e.g. after a theme change) only
+        # needs the status labels redrawn
+        if content != self._validated_content:
+            try:
+                yaml.load(content, Loader=_Loader)
+                error = None
+            except yaml.YAMLError as e:
+                error = e
+            self._validated_content = content
+            self._validation_error = error
+        
+        self._show_validation(self._validation_error)
+    
+    def _show_validation(self, e: Optional[yaml.YAMLError]) -> None:
+        """Show the validation result in the status bar."""
+        if e is None:
             self.validation_icon.setText("✓")
             self.validation_icon.setStyleSheet(f"color: {self.style_manager.colors['success']};")
             self.validation_label.setText("Valid YAML")
             self.validation_label.setStyleSheet(f"color: {self.style_manager.colors['text_secondary']};")
-        except yaml.YAMLError as e:
+        else:
             self.validation_icon.setText("✗")
             self.validation_icon.setStyleSheet(f"color: {self.style_manager.colors['error']};")
             
@@ -2,13 +2,17 @@
 Log viewer component for displaying execution output.
 """
 
-from typing import Optional, List
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import groupby
+from typing import Optional, List, Dict, Deque, Iterable, Tuple
 from datetime import datetime
+from pathlib import Path
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLabel,
+    QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QLabel,
     QFrame, QPushButton, QToolButton, QComboBox, QLineEdit,
-    QFileDialog, QSizePolicy,
+    QFileDialog, QSizePolicy, QMessageBox,
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QTextCursor, QColor, QTextCharFormat, QFont
@@ -20,11 +24,12 @@ except ImportError:
     HAS_QTAWESOME = False
 
 from .styles import StyleManager
-from ..core.rule_engine import LogEntry
+from ..core.rule_engine import LogEntry, write_log_entries
 
 
+@lru_cache(maxsize=256)
 def get_icon(name: str, color: str = "#cdd6f4"):
-    """Get an icon, with fallback for missing qtawesome."""
+    """Get an icon (cached per name and color), with fallback for missing qtawesome."""
     if HAS_QTAWESOME:
         try:
             return qta.icon(name, color=color)
@@ -47,21 +52,95 @@ class LogViewer(QWidget):
     - Export to file
     """
     
-    def __init__(self, style_manager: StyleManager, parent: Optional[QWidget] = None):
+    # Entries arriving within this window are drawn in one document update
+    FLUSH_INTERVAL_MS = 50
+    
+    # Idle time after the last keystroke before the search is applied
+    SEARCH_DELAY_MS = 200
+    
+    # Theme color used for each log level
+    LEVEL_COLORS = {
+        "info": "text",
+        "success": "success",
+        "warning": "warning",
+        "error": "error",
+        "debug": "text_secondary",
+    }
+    
+    # Default number of entries kept before the oldest are dropped
+    MAX_ENTRIES = 100_000
+    
+    LEVEL_ICONS = {
+        "info": "ℹ",
+        "success": "✓",
+        "warning": "⚠",
+        "error": "✗",
+        "debug": "🔧",
+    }
+    
+    def __init__(
+        self,
+        style_manager: StyleManager,
+        parent: Optional[QWidget] = None,
+        max_entries: int = MAX_ENTRIES,
+    ):
         """Initialize the log viewer."""
         super().__init__(parent)
         self.style_manager = style_manager
-        self.entries: List[LogEntry] = []
-        self.filtered_entries: List[LogEntry] = []
+        self.entries: Deque[LogEntry] = deque()
+        self.filtered_entries: Deque[LogEntry] = deque()
+        self._max_entries = max(1, max_entries)
+        
+        # Lowercased searchable text of each entry, keyed by id(entry) and
+        # built once when the entry is added
+        self._search_keys: Dict[int, str] = {}
+        
+        # Display line of each entry, keyed by id(entry) and built the
+        # first time the entry is drawn
+        self._rendered: Dict[int, str] = {}
+        
+        # Number of entries per level, kept up to date as entries are added
+        self._level_counts: Counter = Counter()
         
         self._auto_scroll = True
         self._filter_level = "all"
         self._search_text = ""
+        self._search_lower = ""
+        self._pending_search = ""
+        
+        # Entries waiting to be drawn by the next flush, with whether they
+        # pass the current filter
+        self._pending: List[Tuple[LogEntry, bool]] = []
         
         self._setup_ui()
+        
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
+        
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._apply_search)
+    
+    def _build_formats(self) -> None:
+        """Build the per-level text formats for the current theme."""
+        colors = self.style_manager.colors
+        self._formats = {}
+        for level, color_key in self.LEVEL_COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(colors[color_key]))
+            self._formats[level] = text_format
+        
+        # Unknown levels use the plain text color, like info
+        self._default_format = self._formats["info"]
     
     def _setup_ui(self) -> None:
         """Set up the UI components."""
+        icon_color = self.style_manager.get_icon_color()
+        self._build_formats()
+        
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
@@ -104,7 +183,7 @@ class LogViewer(QWidget):
         
         # Clear button
         clear_btn = QToolButton()
-        clear_btn.setIcon(get_icon("mdi.delete-sweep", self.style_manager.get_icon_color()))
+        clear_btn.setIcon(get_icon("mdi.delete-sweep", icon_color))
         clear_btn.setToolTip("Clear log")
         clear_btn.clicked.connect(self.clear)
         header_layout.addWidget(clear_btn)
@@ -120,7 +199,7 @@ class LogViewer(QWidget):
         
         # Export button
         export_btn = QToolButton()
-        export_btn.setIcon(get_icon("mdi.download", self.style_manager.get_icon_color()))
+        export_btn.setIcon(get_icon("mdi.download", icon_color))
         export_btn.setToolTip("Export log")
         export_btn.clicked.connect(self._on_export)
         header_layout.addWidget(export_btn)
@@ -128,11 +207,15 @@ class LogViewer(QWidget):
         layout.addWidget(header)
         
         # Log text area
-        self.log_text = QTextEdit()
+        # Every entry gets one text block; filtering hides blocks rather
+        # than removing them (QPlainTextEdit's layout supports hidden blocks)
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setFont(QFont("Consolas", 10))
+        # One block per displayed entry plus the trailing empty block
+        self.log_text.document().setMaximumBlockCount(self._max_entries + 1)
         self.log_text.setStyleSheet(f"""
-            QTextEdit {{
+            QPlainTextEdit {{
                 background-color: {self.style_manager.colors["background"]};
                 color: {self.style_manager.colors["text"]};
                 border: none;
@@ -168,6 +251,7 @@ class LogViewer(QWidget):
     def refresh_style(self, style_manager: StyleManager) -> None:
         """Refresh styles after theme change."""
         self.style_manager = style_manager
+        self._build_formats()
         
         # Update all frames (header and status bar)
         for child in self.children():
@@ -181,7 +265,7 @@ class LogViewer(QWidget):
         
         # Update log text area
         self.log_text.setStyleSheet(f"""
-            QTextEdit {{
+            QPlainTextEdit {{
                 background-color: {style_manager.colors["background"]};
                 color: {style_manager.colors["text"]};
                 border: none;
@@ -194,7 +278,7 @@ class LogViewer(QWidget):
         self.stats_label.setStyleSheet(f"color: {style_manager.colors['text_secondary']}; font-size: 11px;")
         
         # Re-render the log with new colors
-        self._refresh_display()
+        self._rebuild_display()
     
     def add_entry(self, entry: LogEntry) -> None:
         """
@@ -203,49 +287,119 @@ class LogViewer(QWidget):
         Args:
             entry: Log entry to add
         """
-        self.entries.append(entry)
+        self.add_entries([entry])
+    
+    def add_entries(self, entries: List[LogEntry]) -> None:
+        """
+        Add several log entries.
         
-        # Check if entry matches current filter
-        if self._matches_filter(entry):
-            self.filtered_entries.append(entry)
-            self._append_entry_to_display(entry)
+        The entries are drawn, and the status line updated, on the next
+        flush, so bursts of entries cost a single document update.
         
+        Args:
+            entries: Log entries to add, in order
+        """
+        search_keys = self._search_keys
+        level_counts = self._level_counts
+        max_entries = self._max_entries
+        if len(entries) > max_entries:
+            # The older part of the batch would be dropped straight away
+            entries = entries[-max_entries:]
+        for entry in entries:
+            if len(self.entries) >= max_entries:
+                self._forget_oldest()
+            self.entries.append(entry)
+            level_counts[entry.level] += 1
+            search_keys[id(entry)] = self._search_key(entry)
+            visible = self._matches_filter(entry)
+            if visible:
+                self.filtered_entries.append(entry)
+            self._pending.append((entry, visible))
+        
+        # Entries dropped before they were drawn need no text blocks; the
+        # document trims drawn ones itself via its maximum block count
+        if len(self._pending) > max_entries:
+            del self._pending[:-max_entries]
+        
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def set_max_entries(self, max_entries: int) -> None:
+        """
+        Change how many entries are kept.
+        
+        Args:
+            max_entries: Number of most recent entries to keep
+        """
+        # Draw pending entries first so blocks and entries line up, then
+        # drop the same oldest entries from both
+        self._draw_pending()
+        self._max_entries = max(1, max_entries)
+        while len(self.entries) > self._max_entries:
+            self._forget_oldest()
+        self.log_text.document().setMaximumBlockCount(self._max_entries + 1)
+        self._update_status()
+    
+    def _forget_oldest(self) -> None:
+        """Drop the oldest entry and its bookkeeping."""
+        entry = self.entries.popleft()
+        self._level_counts[entry.level] -= 1
+        self._search_keys.pop(id(entry), None)
+        self._rendered.pop(id(entry), None)
+        # Both deques are in insertion order, so it can only be the first
+        # filtered entry; its text block is trimmed by the document itself
+        if self.filtered_entries and self.filtered_entries[0] is entry:
+            self.filtered_entries.popleft()
+    
+    def _flush_pending(self) -> None:
+        """Draw the entries added since the last flush."""
+        self._draw_pending()
         self._update_status()
     
-    def _append_entry_to_display(self, entry: LogEntry) -> None:
-        """Append an entry to the text display."""
+    def _draw_pending(self) -> None:
+        """Append pending entries to the text display."""
+        if self._pending:
+            self._append_entries_to_display(self._pending)
+            self._pending = []
+    
+    def _append_entries_to_display(self, items: Iterable[Tuple[LogEntry, bool]]) -> None:
+        """Append (entry, visible) pairs to the text display as a single edit."""
         cursor = self.log_text.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
         
-        # Format based on level
-        format = QTextCharFormat()
-        colors = self.style_manager.colors
-        
-        level_colors = {
-            "info": colors["text"],
-            "success": colors["success"],
-            "warning": colors["warning"],
-            "error": colors["error"],
-            "debug": colors["text_secondary"],
-        }
-        
-        level_icons = {
-            "info": "ℹ",
-            "success": "✓",
-            "warning": "⚠",
-            "error": "✗",
-            "debug": "🔧",
-        }
-        
-        color = level_colors.get(entry.level, colors["text"])
-        icon = level_icons.get(entry.level, "•")
-        format.setForeground(QColor(color))
+        # One edit block lets the document lay out the whole batch at once,
+        # and each run of entries sharing a format is a single insert
+        cursor.beginEditBlock()
+        for (level, visible), run in groupby(items, key=lambda item: (item[0].level, item[1])):
+            texts = [self._entry_text(entry) for entry, _ in run]
+            cursor.insertText("".join(texts), self._formats.get(level, self._default_format))
+            if not visible:
+                # The cursor is now in the next, empty block
+                block = cursor.block()
+                for _ in texts:
+                    block = block.previous()
+                    block.setVisible(False)
+        cursor.endEditBlock()
         
+        # Auto-scroll
+        if self._auto_scroll:
+            self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+    
+    def _entry_text(self, entry: LogEntry) -> str:
+        """Get the cached display line of an entry."""
+        text = self._rendered.get(id(entry))
+        if text is None:
+            text = self._render_entry(entry)
+            self._rendered[id(entry)] = text
+        return text
+    
+    def _render_entry(self, entry: LogEntry) -> str:
+        """Build the display line of an entry."""
         # Timestamp
-        timestamp = entry.timestamp.strftime("%H:%M:%S")
+        timestamp = entry.format_time("%H:%M:%S")
         
         # Build message
-        parts = [f"[{timestamp}]", icon]
+        parts = [f"[{timestamp}]", self.LEVEL_ICONS.get(entry.level, "•")]
         
         if entry.rule_name:
             parts.append(f"[{entry.rule_name}]")
@@ -260,22 +414,35 @@ class LogViewer(QWidget):
         if entry.action_name:
             parts.append(f"<{entry.action_name}>")
         
-        parts.append(entry.message)
-        
-        # Insert text
-        cursor.insertText(" ".join(parts) + "\n", format)
+        # Keep multi-line messages in one text block
+        parts.append(entry.message.replace("\n", "\u2028"))
         
-        # Auto-scroll
-        if self._auto_scroll:
-            self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+        return " ".join(parts) + "\n"
     
     def clear(self) -> None:
         """Clear all log entries."""
-        self.entries = []
-        self.filtered_entries = []
+        self.entries = deque()
+        self.filtered_entries = deque()
+        self._search_keys = {}
+        self._rendered = {}
+        self._level_counts.clear()
+        self._pending = []
+        self._flush_timer.stop()
         self.log_text.clear()
         self._update_status()
     
+    def shows_level(self, level: str) -> bool:
+        """
+        Check whether the level filter lets entries of a level through.
+        
+        Args:
+            level: Log level name
+            
+        Returns:
+            True if entries of this level can be displayed
+        """
+        return self._filter_level in ("all", level)
+    
     def _matches_filter(self, entry: LogEntry) -> bool:
         """Check if an entry matches the current filter."""
         # Level filter
@@ -284,24 +451,77 @@ class LogViewer(QWidget):
                 return False
         
         # Search filter
-        if self._search_text:
-            search_lower = self._search_text.lower()
-            if (search_lower not in entry.message.lower() and
-                search_lower not in (entry.file_path or "").lower() and
-                search_lower not in (entry.rule_name or "").lower()):
-                return False
+        search_lower = self._search_lower
+        if search_lower and search_lower not in self._search_keys[id(entry)]:
+            return False
         
         return True
     
-    def _refresh_display(self) -> None:
-        """Refresh the display with current filters."""
+    @staticmethod
+    def _search_key(entry: LogEntry) -> str:
+        """Build the lowercased text that searches are matched against."""
+        # Newlines can't be typed into the search box, so a match never
+        # spans two fields
+        return "\n".join((
+            entry.message.lower(),
+            (entry.file_path or "").lower(),
+            (entry.rule_name or "").lower(),
+        ))
+    
+    def _refresh_display(self, narrow: bool = False) -> None:
+        """
+        Re-apply the current filters by showing and hiding text blocks.
+        
+        Args:
+            narrow: The filter can only have become stricter, so entries
+                that are hidden now stay hidden without being re-checked
+        """
+        self._draw_pending()
+        
+        showing_all = self._filter_level == "all" and not self._search_lower
+        if showing_all and len(self.filtered_entries) == len(self.entries):
+            # Every block is visible already
+            self._update_status()
+            return
+        
+        document = self.log_text.document()
+        match = self._matches_filter
+        filtered: Deque[LogEntry] = deque()
+        block = document.firstBlock()
+        for entry in self.entries:
+            was_visible = block.isVisible()
+            visible = (was_visible or not narrow) and match(entry)
+            if visible:
+                filtered.append(entry)
+            if visible != was_visible:
+                block.setVisible(visible)
+            block = block.next()
+        self.filtered_entries = filtered
+        
+        # Block visibility changes are not edits, so request a relayout
+        document.markContentsDirty(0, document.characterCount())
+        self.log_text.viewport().update()
+        if self._auto_scroll:
+            self.log_text.moveCursor(QTextCursor.MoveOperation.End)
+        
+        self._update_status()
+    
+    def _rebuild_display(self) -> None:
+        """Redraw every entry, e.g. after the theme colors changed."""
         self.log_text.clear()
-        self.filtered_entries = []
+        self._pending = []
+        self._flush_timer.stop()
         
+        match = self._matches_filter
+        filtered: Deque[LogEntry] = deque()
+        items = []
         for entry in self.entries:
-            if self._matches_filter(entry):
-                self.filtered_entries.append(entry)
-                self._append_entry_to_display(entry)
+            visible = match(entry)
+            if visible:
+                filtered.append(entry)
+            items.append((entry, visible))
+        self.filtered_entries = filtered
+        self._append_entries_to_display(items)
         
         self._update_status()
     
@@ -316,9 +536,9 @@ class LogViewer(QWidget):
             self.count_label.setText(f"{filtered} of {total} entries")
         
         # Calculate stats
-        success = sum(1 for e in self.entries if e.level == "success")
-        errors = sum(1 for e in self.entries if e.level == "error")
-        warnings = sum(1 for e in self.entries if e.level == "warning")
+        success = self._level_counts["success"]
+        errors = self._level_counts["error"]
+        warnings = self._level_counts["warning"]
         
         stats_parts = []
         if success:
@@ -336,9 +556,18 @@ class LogViewer(QWidget):
         self._refresh_display()
     
     def _on_search_changed(self, text: str) -> None:
-        """Handle search text change."""
-        self._search_text = text
-        self._refresh_display()
+        """Handle search text change; applied once typing pauses."""
+        self._pending_search = text
+        self._search_timer.start()
+    
+    def _apply_search(self) -> None:
+        """Apply the pending search text."""
+        previous = self._search_lower
+        self._search_text = self._pending_search
+        self._search_lower = self._search_text.lower()
+        
+        # A longer term can only narrow the current matches
+        self._refresh_display(narrow=bool(previous) and self._search_lower.startswith(previous))
     
     def _on_scroll_toggle(self, checked: bool) -> None:
         """Handle auto-scroll toggle."""
@@ -358,33 +587,14 @@ class LogViewer(QWidget):
         if not path:
             return
         
+        if path.endswith(".json"):
+            format = "json"
+        elif path.endswith(".csv"):
+            format = "csv"
+        else:
+            format = "txt"
+        
         try:
-            if path.endswith(".json"):
-                import json
-                data = [entry.to_dict() for entry in self.entries]
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-            elif path.endswith(".csv"):
-                import csv
-                with open(path, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Timestamp", "Level", "Message", "Rule", "File", "Action"])
-                    for entry in self.entries:
-                        writer.writerow([
-                            entry.timestamp.isoformat(),
-                            entry.level,
-                            entry.message,
-                            entry.rule_name or "",
-                            entry.file_path or "",
-                            entry.action_name or "",
-                        ])
-            else:
-                lines = []
-                for entry in self.entries:
-                    timestamp = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    lines.append(f"[{timestamp}] [{entry.level.upper()}] {entry.message}")
-                with open(path, "w", encoding="utf-8") as f:
-                    f.write("\n".join(lines))
+            write_log_entries(self.entries, Path(path), format)
         except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Export Failed", f"Failed to export log: {e}")
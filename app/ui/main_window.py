@@ -3,17 +3,21 @@ Main application window for Organize Desktop.
 Provides the primary user interface with sidebar, editor, and log viewer.
 """
 
+import os
 import sys
+import threading
 from pathlib import Path
-from typing import Optional, List
+from functools import lru_cache, partial
+from typing import Optional, List, Dict, Tuple, Callable
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QToolBar, QStatusBar, QMenuBar, QMenu, QLabel, QPushButton,
     QFileDialog, QMessageBox, QStackedWidget, QDockWidget,
     QApplication, QSizePolicy, QFrame, QToolButton, QSpacerItem,
+    QListWidget, QListWidgetItem,
 )
-from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal, QSettings
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal, pyqtSlot, QSettings
 from PyQt6.QtGui import QAction, QIcon, QKeySequence, QCloseEvent
 
 try:
@@ -24,7 +28,7 @@ except ImportError:
 
 from ..core.settings import Settings
 from ..core.config_manager import ConfigManager
-from ..core.rule_engine import RuleEngine, ExecutionStatus, LogEntry
+from ..core.rule_engine import RuleEngine, ExecutionStatus
 from ..core.file_watcher import ConfigFileWatcher
 from .styles import StyleManager, Theme
 from .rule_editor import RuleEditor
@@ -33,8 +37,9 @@ from .log_viewer import LogViewer
 from .settings_dialog import SettingsDialog
 
 
+@lru_cache(maxsize=256)
 def get_icon(name: str, color: str = "#cdd6f4") -> QIcon:
-    """Get an icon, with fallback for missing qtawesome."""
+    """Get an icon (cached per name and color), with fallback for missing qtawesome."""
     if HAS_QTAWESOME:
         try:
             return qta.icon(name, color=color)
@@ -43,6 +48,16 @@ def get_icon(name: str, color: str = "#cdd6f4") -> QIcon:
     return QIcon()
 
 
+def preload_icon_font() -> None:
+    """Load qtawesome's icon fonts now rather than inside the first icon request."""
+    if HAS_QTAWESOME:
+        try:
+            # Any icon request loads the fonts; this one is used by the sidebar
+            qta.icon("mdi.refresh")
+        except Exception:
+            pass
+
+
 class MainWindow(QMainWindow):
     """
     Main application window.
@@ -60,27 +75,87 @@ class MainWindow(QMainWindow):
     execution_finished = pyqtSignal()
     
     # Thread-safe signals for rule engine callbacks
-    _log_entry_signal = pyqtSignal(object)  # LogEntry
     _status_change_signal = pyqtSignal(object)  # ExecutionStatus
     _execution_complete_signal = pyqtSignal(object)  # ExecutionResult
+    _config_list_signal = pyqtSignal(int, list)  # scan id, config paths
+    _config_file_changed_signal = pyqtSignal(object)  # Path
+    
+    # Interval for pulling queued log entries into the log viewer (~one frame)
+    LOG_DRAIN_INTERVAL_MS = 16
+    
+    # Button sets for the confirmation prompts, combined once
+    _SAVE_DISCARD_CANCEL = (
+        QMessageBox.StandardButton.Save |
+        QMessageBox.StandardButton.Discard |
+        QMessageBox.StandardButton.Cancel
+    )
+    _YES_NO = QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+    
+    # Menu bar layout: (title, items). An item is (text, icon, shortcut,
+    # handler name), None for a separator, or the name of a method that
+    # adds its own entries to the menu.
+    MENU_SPEC = (
+        ("&File", (
+            ("&New Config", "mdi.file-plus", QKeySequence.StandardKey.New, "_on_new_config"),
+            ("&Open Config...", "mdi.folder-open", QKeySequence.StandardKey.Open, "_on_open_config"),
+            "_add_recent_menu",
+            None,
+            ("&Save", "mdi.content-save", QKeySequence.StandardKey.Save, "_on_save_config"),
+            ("Save &As...", "mdi.content-save-edit", "Ctrl+Shift+S", "_on_save_config_as"),
+            None,
+            ("E&xit", "mdi.exit-to-app", QKeySequence.StandardKey.Quit, "close"),
+        )),
+        ("&Edit", (
+            ("&Undo", "mdi.undo", QKeySequence.StandardKey.Undo, "_on_undo"),
+            ("&Redo", "mdi.redo", QKeySequence.StandardKey.Redo, "_on_redo"),
+            None,
+            ("Add &Rule", "mdi.plus", "Ctrl+R", "_on_add_rule"),
+            None,
+            ("&Settings...", "mdi.cog", QKeySequence.StandardKey.Preferences, "_on_settings"),
+        )),
+        ("&Run", (
+            ("&Simulate", "mdi.test-tube", "F5", "_on_simulate"),
+            ("&Run", "mdi.play", "F6", "_on_run"),
+            None,
+            ("S&top", "mdi.stop", "Shift+F5", "_on_stop"),
+            None,
+            ("&Clear Log", "mdi.delete-sweep", None, "_on_clear_log"),
+        )),
+        ("&View", (
+            "_add_view_menu_items",
+        )),
+        ("&Help", (
+            ("&Documentation", "mdi.book-open-variant", QKeySequence.StandardKey.HelpContents, "_on_documentation"),
+            None,
+            ("&About", "mdi.information", None, "_on_about"),
+        )),
+    )
     
     def __init__(self):
         """Initialize the main window."""
         super().__init__()
         
+        # Needs the QApplication, so it cannot run at import time
+        preload_icon_font()
+        
         # Initialize core components
         self.settings = Settings.load()
         self.style_manager = StyleManager(
             Theme.DARK if self.settings.ui.theme == "dark" else Theme.LIGHT
         )
+        self._child_qss_cache: Dict[Theme, Dict[str, str]] = {}
+        # refresh_style of each themed child widget, registered as it is built
+        self._style_refreshers: List[Callable[[StyleManager], None]] = []
         self.config_manager = ConfigManager()
-        self.rule_engine = RuleEngine()
+        self.rule_engine = RuleEngine(
+            max_log_entries=self.settings.ui.log_max_lines,
+            queue_logs=True,
+        )
         self.file_watcher = ConfigFileWatcher()
         
         # Set up the window
         self.setWindowTitle("Organize Desktop")
         self.setMinimumSize(1200, 700)
-        self._restore_geometry()
         
         # Apply stylesheet
         self.setStyleSheet(self.style_manager.get_stylesheet())
@@ -90,156 +165,104 @@ class MainWindow(QMainWindow):
         self._create_toolbar()
         self._create_central_widget()
         self._create_status_bar()
+        self._restore_geometry()
         
         # Set up signals
         self._setup_signals()
         
-        # Load initial state
-        self._load_initial_state()
+        # Load initial state once the window has been shown
+        QTimer.singleShot(0, self._load_initial_state)
         
         # Start file watcher
         self.file_watcher.start()
     
     def _create_menu_bar(self) -> None:
-        """Create the application menu bar."""
+        """Create the application menu bar from MENU_SPEC."""
         menubar = self.menuBar()
         
-        # File menu
-        file_menu = menubar.addMenu("&File")
-        
-        new_action = QAction(get_icon("mdi.file-plus", self.style_manager.get_icon_color()), "&New Config", self)
-        new_action.setShortcut(QKeySequence.StandardKey.New)
-        new_action.triggered.connect(self._on_new_config)
-        file_menu.addAction(new_action)
-        
-        open_action = QAction(get_icon("mdi.folder-open", self.style_manager.get_icon_color()), "&Open Config...", self)
-        open_action.setShortcut(QKeySequence.StandardKey.Open)
-        open_action.triggered.connect(self._on_open_config)
-        file_menu.addAction(open_action)
-        
-        # Recent files submenu
+        # Menu icons are rendered the first time their menu is opened
+        self._pending_menu_icons: Dict[QMenu, List[Tuple[QAction, str]]] = {}
+        
+        for title, items in self.MENU_SPEC:
+            menu = menubar.addMenu(title)
+            for item in items:
+                if item is None:
+                    menu.addSeparator()
+                elif isinstance(item, str):
+                    getattr(self, item)(menu)
+                else:
+                    text, icon_name, shortcut, handler = item
+                    action = QAction(text, self)
+                    self._defer_menu_icon(menu, action, icon_name)
+                    if shortcut is not None:
+                        action.setShortcut(QKeySequence(shortcut))
+                    action.triggered.connect(getattr(self, handler))
+                    menu.addAction(action)
+    
+    def _add_recent_menu(self, menu: QMenu) -> None:
+        """Add the recent files submenu."""
         self.recent_menu = QMenu("Open &Recent", self)
-        self.recent_menu.setIcon(get_icon("mdi.history", self.style_manager.get_icon_color()))
+        self.recent_menu.triggered.connect(self._on_recent_triggered)
+        self._defer_menu_icon(menu, self.recent_menu.menuAction(), "mdi.history")
         self._update_recent_menu()
-        file_menu.addMenu(self.recent_menu)
-        
-        file_menu.addSeparator()
-        
-        save_action = QAction(get_icon("mdi.content-save", self.style_manager.get_icon_color()), "&Save", self)
-        save_action.setShortcut(QKeySequence.StandardKey.Save)
-        save_action.triggered.connect(self._on_save_config)
-        file_menu.addAction(save_action)
-        
-        save_as_action = QAction(get_icon("mdi.content-save-edit", self.style_manager.get_icon_color()), "Save &As...", self)
-        save_as_action.setShortcut(QKeySequence("Ctrl+Shift+S"))
-        save_as_action.triggered.connect(self._on_save_config_as)
-        file_menu.addAction(save_as_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction(get_icon("mdi.exit-to-app", self.style_manager.get_icon_color()), "E&xit", self)
-        exit_action.setShortcut(QKeySequence.StandardKey.Quit)
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
-        
-        # Edit menu
-        edit_menu = menubar.addMenu("&Edit")
-        
-        undo_action = QAction(get_icon("mdi.undo", self.style_manager.get_icon_color()), "&Undo", self)
-        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
-        undo_action.triggered.connect(self._on_undo)
-        edit_menu.addAction(undo_action)
-        
-        redo_action = QAction(get_icon("mdi.redo", self.style_manager.get_icon_color()), "&Redo", self)
-        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
-        redo_action.triggered.connect(self._on_redo)
-        edit_menu.addAction(redo_action)
-        
-        edit_menu.addSeparator()
-        
-        add_rule_action = QAction(get_icon("mdi.plus", self.style_manager.get_icon_color()), "Add &Rule", self)
-        add_rule_action.setShortcut(QKeySequence("Ctrl+R"))
-        add_rule_action.triggered.connect(self._on_add_rule)
-        edit_menu.addAction(add_rule_action)
-        
-        edit_menu.addSeparator()
-        
-        settings_action = QAction(get_icon("mdi.cog", self.style_manager.get_icon_color()), "&Settings...", self)
-        settings_action.setShortcut(QKeySequence.StandardKey.Preferences)
-        settings_action.triggered.connect(self._on_settings)
-        edit_menu.addAction(settings_action)
-        
-        # Run menu
-        run_menu = menubar.addMenu("&Run")
-        
-        simulate_action = QAction(get_icon("mdi.test-tube", self.style_manager.get_icon_color()), "&Simulate", self)
-        simulate_action.setShortcut(QKeySequence("F5"))
-        simulate_action.triggered.connect(self._on_simulate)
-        run_menu.addAction(simulate_action)
-        
-        run_action = QAction(get_icon("mdi.play", self.style_manager.get_icon_color()), "&Run", self)
-        run_action.setShortcut(QKeySequence("F6"))
-        run_action.triggered.connect(self._on_run)
-        run_menu.addAction(run_action)
-        
-        run_menu.addSeparator()
-        
-        stop_action = QAction(get_icon("mdi.stop", self.style_manager.get_icon_color()), "S&top", self)
-        stop_action.setShortcut(QKeySequence("Shift+F5"))
-        stop_action.triggered.connect(self._on_stop)
-        run_menu.addAction(stop_action)
-        
-        run_menu.addSeparator()
-        
-        clear_log_action = QAction(get_icon("mdi.delete-sweep", self.style_manager.get_icon_color()), "&Clear Log", self)
-        clear_log_action.triggered.connect(self._on_clear_log)
-        run_menu.addAction(clear_log_action)
-        
-        # View menu
-        view_menu = menubar.addMenu("&View")
-        
+        menu.addMenu(self.recent_menu)
+    
+    def _add_view_menu_items(self, menu: QMenu) -> None:
+        """Add the log panel toggle and theme submenu."""
         toggle_log_action = QAction("Toggle &Log Panel", self)
         toggle_log_action.setShortcut(QKeySequence("Ctrl+L"))
         toggle_log_action.setCheckable(True)
         toggle_log_action.setChecked(True)
         toggle_log_action.triggered.connect(self._on_toggle_log)
-        view_menu.addAction(toggle_log_action)
+        menu.addAction(toggle_log_action)
         self._toggle_log_action = toggle_log_action
         
-        view_menu.addSeparator()
+        menu.addSeparator()
+        
+        # One handler for the whole submenu; each action carries its theme
+        theme_menu = menu.addMenu("&Theme")
+        theme_menu.triggered.connect(lambda action: self._on_theme_change(action.data()))
         
-        theme_menu = view_menu.addMenu("&Theme")
         dark_action = QAction("&Dark", self)
+        dark_action.setData("dark")
         dark_action.setCheckable(True)
         dark_action.setChecked(self.settings.ui.theme == "dark")
-        dark_action.triggered.connect(lambda: self._on_theme_change("dark"))
         theme_menu.addAction(dark_action)
         
         light_action = QAction("&Light", self)
+        light_action.setData("light")
         light_action.setCheckable(True)
         light_action.setChecked(self.settings.ui.theme == "light")
-        light_action.triggered.connect(lambda: self._on_theme_change("light"))
         theme_menu.addAction(light_action)
         
-        self._theme_actions = [dark_action, light_action]
-        
-        # Help menu
-        help_menu = menubar.addMenu("&Help")
-        
-        docs_action = QAction(get_icon("mdi.book-open-variant", self.style_manager.get_icon_color()), "&Documentation", self)
-        docs_action.setShortcut(QKeySequence.StandardKey.HelpContents)
-        docs_action.triggered.connect(self._on_documentation)
-        help_menu.addAction(docs_action)
-        
-        help_menu.addSeparator()
-        
-        about_action = QAction(get_icon("mdi.information", self.style_manager.get_icon_color()), "&About", self)
-        about_action.triggered.connect(self._on_about)
-        help_menu.addAction(about_action)
+        self._theme_actions: Dict[str, QAction] = {
+            "dark": dark_action,
+            "light": light_action,
+        }
+    
+    def _defer_menu_icon(self, menu: QMenu, action: QAction, icon_name: str) -> None:
+        """Set an action's icon once its menu is about to be shown."""
+        pending = self._pending_menu_icons.get(menu)
+        if pending is None:
+            pending = self._pending_menu_icons[menu] = []
+            menu.aboutToShow.connect(partial(self._populate_menu_icons, menu))
+        pending.append((action, icon_name))
+    
+    def _populate_menu_icons(self, menu: QMenu) -> None:
+        """Render the deferred icons of a menu."""
+        pending = self._pending_menu_icons.pop(menu, None)
+        if not pending:
+            return
+        icon_color = self.style_manager.get_icon_color()
+        for action, icon_name in pending:
+            action.setIcon(get_icon(icon_name, icon_color))
     
     def _create_toolbar(self) -> None:
         """Create the main toolbar."""
+        icon_color = self.style_manager.get_icon_color()
+        
         toolbar = QToolBar("Main Toolbar")
+        toolbar.setObjectName("main_toolbar")  # Needed by saveState()
         toolbar.setMovable(False)
         toolbar.setIconSize(QSize(24, 24))
         toolbar.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonIconOnly)
@@ -247,21 +270,21 @@ class MainWindow(QMainWindow):
         
         # New config
         new_btn = QToolButton()
-        new_btn.setIcon(get_icon("mdi.file-plus", self.style_manager.get_icon_color()))
+        new_btn.setIcon(get_icon("mdi.file-plus", icon_color))
         new_btn.setToolTip("New Config (Ctrl+N)")
         new_btn.clicked.connect(self._on_new_config)
         toolbar.addWidget(new_btn)
         
         # Open config
         open_btn = QToolButton()
-        open_btn.setIcon(get_icon("mdi.folder-open", self.style_manager.get_icon_color()))
+        open_btn.setIcon(get_icon("mdi.folder-open", icon_color))
         open_btn.setToolTip("Open Config (Ctrl+O)")
         open_btn.clicked.connect(self._on_open_config)
         toolbar.addWidget(open_btn)
         
         # Save config
         self.save_btn = QToolButton()
-        self.save_btn.setIcon(get_icon("mdi.content-save", self.style_manager.get_icon_color()))
+        self.save_btn.setIcon(get_icon("mdi.content-save", icon_color))
         self.save_btn.setToolTip("Save Config (Ctrl+S)")
         self.save_btn.clicked.connect(self._on_save_config)
         toolbar.addWidget(self.save_btn)
@@ -270,7 +293,7 @@ class MainWindow(QMainWindow):
         
         # Add rule
         add_rule_btn = QToolButton()
-        add_rule_btn.setIcon(get_icon("mdi.plus-box", self.style_manager.get_icon_color()))
+        add_rule_btn.setIcon(get_icon("mdi.plus-box", icon_color))
         add_rule_btn.setToolTip("Add Rule (Ctrl+R)")
         add_rule_btn.clicked.connect(self._on_add_rule)
         toolbar.addWidget(add_rule_btn)
@@ -279,7 +302,7 @@ class MainWindow(QMainWindow):
         
         # Simulate
         self.simulate_btn = QToolButton()
-        self.simulate_btn.setIcon(get_icon("mdi.test-tube", self.style_manager.get_icon_color()))
+        self.simulate_btn.setIcon(get_icon("mdi.test-tube", icon_color))
         self.simulate_btn.setToolTip("Simulate (F5)")
         self.simulate_btn.clicked.connect(self._on_simulate)
         toolbar.addWidget(self.simulate_btn)
@@ -306,7 +329,7 @@ class MainWindow(QMainWindow):
         
         # Settings
         settings_btn = QToolButton()
-        settings_btn.setIcon(get_icon("mdi.cog", self.style_manager.get_icon_color()))
+        settings_btn.setIcon(get_icon("mdi.cog", icon_color))
         settings_btn.setToolTip("Settings")
         settings_btn.clicked.connect(self._on_settings)
         toolbar.addWidget(settings_btn)
@@ -314,7 +337,6 @@ class MainWindow(QMainWindow):
     def _create_central_widget(self) -> None:
         """Create the central widget with splitters."""
         self.central_widget = QWidget()
-        self.central_widget.setStyleSheet(f"background-color: {self.style_manager.colors['background']};")
         self.setCentralWidget(self.central_widget)
         
         main_layout = QHBoxLayout(self.central_widget)
@@ -335,25 +357,27 @@ class MainWindow(QMainWindow):
         
         # Editor area (tabs for visual and YAML editor)
         self.editor_stack = QStackedWidget()
-        self.editor_stack.setStyleSheet(f"background-color: {self.style_manager.colors['background']};")
         
         # Rule editor (visual)
         self.rule_editor = RuleEditor(self.style_manager)
         self.rule_editor.rules_changed.connect(self._on_rules_changed)
+        self._style_refreshers.append(self.rule_editor.refresh_style)
         self.editor_stack.addWidget(self.rule_editor)
         
-        # Config editor (YAML)
-        self.config_editor = ConfigEditor(self.style_manager)
-        self.config_editor.content_changed.connect(self._on_content_changed)
-        self.editor_stack.addWidget(self.config_editor)
+        # Config editor (YAML), built the first time its tab is opened
+        self.editor_stack.addWidget(QWidget())
         
         # Editor container with tabs
         editor_container = self._create_editor_container()
         right_splitter.addWidget(editor_container)
         
         # Log viewer
-        self.log_viewer = LogViewer(self.style_manager)
+        self.log_viewer = LogViewer(
+            self.style_manager,
+            max_entries=self.settings.ui.log_max_lines,
+        )
         self.log_dock = self.log_viewer
+        self._style_refreshers.append(self.log_viewer.refresh_style)
         right_splitter.addWidget(self.log_viewer)
         
         # Set splitter sizes
@@ -365,6 +389,8 @@ class MainWindow(QMainWindow):
     
     def _create_sidebar(self) -> QWidget:
         """Create the sidebar with config file list."""
+        icon_color = self.style_manager.get_icon_color()
+        
         sidebar = QFrame()
         sidebar.setProperty("class", "sidebar")
         sidebar.setFixedWidth(250)
@@ -385,7 +411,7 @@ class MainWindow(QMainWindow):
         header_layout.addStretch()
         
         refresh_btn = QToolButton()
-        refresh_btn.setIcon(get_icon("mdi.refresh", self.style_manager.get_icon_color()))
+        refresh_btn.setIcon(get_icon("mdi.refresh", icon_color))
         refresh_btn.setToolTip("Refresh list")
         refresh_btn.clicked.connect(self._refresh_config_list)
         header_layout.addWidget(refresh_btn)
@@ -393,7 +419,6 @@ class MainWindow(QMainWindow):
         layout.addWidget(header)
         
         # Config list
-        from PyQt6.QtWidgets import QListWidget, QListWidgetItem
         self.config_list = QListWidget()
         self.config_list.itemClicked.connect(self._on_config_selected)
         self.config_list.itemDoubleClicked.connect(self._on_config_double_clicked)
@@ -406,12 +431,12 @@ class MainWindow(QMainWindow):
         actions_layout.setSpacing(8)
         
         new_btn = QPushButton("New Config")
-        new_btn.setIcon(get_icon("mdi.plus", self.style_manager.get_icon_color()))
+        new_btn.setIcon(get_icon("mdi.plus", icon_color))
         new_btn.clicked.connect(self._on_new_config)
         actions_layout.addWidget(new_btn)
         
         open_folder_btn = QPushButton("Open Folder")
-        open_folder_btn.setIcon(get_icon("mdi.folder-open", self.style_manager.get_icon_color()))
+        open_folder_btn.setIcon(get_icon("mdi.folder-open", icon_color))
         open_folder_btn.clicked.connect(self._on_open_config_folder)
         actions_layout.addWidget(open_folder_btn)
         
@@ -488,19 +513,32 @@ class MainWindow(QMainWindow):
     def _setup_signals(self) -> None:
         """Set up signal connections."""
         # Connect thread-safe signals to handlers
-        self._log_entry_signal.connect(self._on_log_entry)
         self._status_change_signal.connect(self._on_execution_status_change)
         self._execution_complete_signal.connect(self._on_execution_complete)
         
         # Rule engine callbacks - emit signals instead of direct calls
         self.rule_engine.set_callbacks(
             on_status_change=lambda status: self._status_change_signal.emit(status),
-            on_log=lambda entry: self._log_entry_signal.emit(entry),
             on_complete=lambda result: self._execution_complete_signal.emit(result),
         )
         
-        # File watcher callback
-        self.file_watcher.set_config_callback(self._on_config_file_changed)
+        # Log entries are queued by the engine and pulled in batches here
+        self._log_drain_timer = QTimer(self)
+        self._log_drain_timer.setInterval(self.LOG_DRAIN_INTERVAL_MS)
+        self._log_drain_timer.timeout.connect(self._drain_log_queue)
+        
+        # File watcher callback, fired on the watcher's timer thread, so
+        # the GUI thread handles it from its event queue
+        self._config_file_changed_signal.connect(
+            self._on_config_file_changed, Qt.ConnectionType.QueuedConnection
+        )
+        self.file_watcher.set_config_callback(self._config_file_changed_signal.emit)
+        self._reload_prompt_open = False
+        
+        # Config directory scans finish on a worker thread
+        self._config_scan_id = 0
+        self._listed_configs: List[str] = []
+        self._config_list_signal.connect(self._populate_config_list)
     
     def _load_initial_state(self) -> None:
         """Load the initial application state."""
@@ -519,25 +557,51 @@ class MainWindow(QMainWindow):
         self._update_editors()
     
     def _restore_geometry(self) -> None:
-        """Restore window geometry from settings."""
-        if self.settings.window_geometry:
+        """Restore window geometry and toolbar state."""
+        qsettings = QSettings("OrganizeDesktop", "MainWindow")
+        geometry = qsettings.value("geometry")
+        if geometry:
+            self.restoreGeometry(geometry)
+        elif self.settings.window_geometry:
+            # Geometry saved by older versions in the settings file
             geo = self.settings.window_geometry
             if all(k in geo for k in ["x", "y", "width", "height"]):
                 self.setGeometry(geo["x"], geo["y"], geo["width"], geo["height"])
+        
+        state = qsettings.value("windowState")
+        if state:
+            self.restoreState(state)
     
     def _save_geometry(self) -> None:
-        """Save window geometry to settings."""
-        geo = self.geometry()
-        self.settings.window_geometry = {
-            "x": geo.x(),
-            "y": geo.y(),
-            "width": geo.width(),
-            "height": geo.height(),
-        }
-        self.settings.save()
+        """
+        Save window geometry and toolbar state.
+        
+        Qt's own encoding also covers the maximized state and the screen
+        the window was on, which a plain rectangle does not.
+        """
+        qsettings = QSettings("OrganizeDesktop", "MainWindow")
+        qsettings.setValue("geometry", self.saveGeometry())
+        qsettings.setValue("windowState", self.saveState())
+        
+        # Write out any settings changes still waiting for their delayed save
+        self.settings.flush()
+    
+    def _ensure_config_editor(self) -> ConfigEditor:
+        """Create the YAML editor in place of its placeholder on first use."""
+        if not hasattr(self, 'config_editor'):
+            self.config_editor = ConfigEditor(self.style_manager)
+            self.config_editor.content_changed.connect(self._on_content_changed)
+            self._style_refreshers.append(self.config_editor.refresh_style)
+            placeholder = self.editor_stack.widget(1)
+            self.editor_stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.editor_stack.insertWidget(1, self.config_editor)
+        return self.config_editor
     
     def _switch_editor(self, index: int) -> None:
         """Switch between visual and YAML editor."""
+        if index == 1:
+            self._ensure_config_editor()
         self.editor_stack.setCurrentIndex(index)
         self.visual_tab.setChecked(index == 0)
         self.yaml_tab.setChecked(index == 1)
@@ -546,13 +610,21 @@ class MainWindow(QMainWindow):
         if index == 1:  # Switching to YAML
             self.config_editor.set_content(self.config_manager.raw_content)
         else:  # Switching to Visual
+            self._flush_editor_changes()
             rules = self.config_manager.get_rules()
             self.rule_editor.set_rules(rules)
     
+    def _flush_editor_changes(self) -> None:
+        """Hand YAML edits still waiting on the editor's timer to the config manager."""
+        if hasattr(self, 'config_editor'):
+            self.config_editor.flush_pending_changes()
+    
     def _update_editors(self) -> None:
         """Update editor contents from config manager."""
         self.rule_editor.set_rules(self.config_manager.get_rules())
-        self.config_editor.set_content(self.config_manager.raw_content)
+        # An unopened YAML editor picks up the content when it is shown
+        if hasattr(self, 'config_editor'):
+            self.config_editor.set_content(self.config_manager.raw_content)
         self.config_label.setText(self.config_manager.filename)
         self._update_window_title()
     
@@ -563,51 +635,93 @@ class MainWindow(QMainWindow):
             title = f"{self.config_manager.filename} - {title}"
         if self.config_manager.is_modified:
             title = f"* {title}"
-        self.setWindowTitle(title)
+        # Called on every editor change; most of them leave the title as is
+        if title != self.windowTitle():
+            self.setWindowTitle(title)
     
     def _update_recent_menu(self) -> None:
         """Update the recent files menu."""
-        self.recent_menu.clear()
+        # Opening a file goes through the menu's triggered signal using the
+        # action data. Old actions are deleted later, since this can run
+        # while one of them is still emitting.
+        for action in self.recent_menu.actions():
+            self.recent_menu.removeAction(action)
+            action.deleteLater()
         
         for entry in self.settings.recent_files:
-            action = QAction(entry.get("name", "Unknown"), self)
+            action = QAction(entry.get("name", "Unknown"), self.recent_menu)
             action.setData(entry.get("path"))
-            action.triggered.connect(lambda checked, p=entry.get("path"): self._load_config(Path(p)))
             self.recent_menu.addAction(action)
         
         if not self.settings.recent_files:
-            action = QAction("No recent files", self)
+            action = QAction("No recent files", self.recent_menu)
             action.setEnabled(False)
             self.recent_menu.addAction(action)
         else:
             self.recent_menu.addSeparator()
-            clear_action = QAction("Clear Recent", self)
+            clear_action = QAction("Clear Recent", self.recent_menu)
             clear_action.triggered.connect(self._on_clear_recent)
             self.recent_menu.addAction(clear_action)
     
+    def _on_recent_triggered(self, action: QAction) -> None:
+        """Open the recent file behind a triggered recent menu action."""
+        path = action.data()
+        if path:
+            self._load_config(Path(path))
+    
     def _refresh_config_list(self) -> None:
-        """Refresh the config file list."""
-        self.config_list.clear()
+        """Rescan the config directories in the background."""
+        self._config_scan_id += 1
+        scan_id = self._config_scan_id
         
-        from PyQt6.QtWidgets import QListWidgetItem
+        def scan() -> None:
+            self._config_list_signal.emit(scan_id, ConfigManager.list_available_config_names())
         
-        configs = ConfigManager.list_available_configs()
-        for config_path in configs:
-            item = QListWidgetItem(config_path.stem)
-            item.setData(Qt.ItemDataRole.UserRole, str(config_path))
-            item.setIcon(get_icon("mdi.file-document", self.style_manager.get_icon_color()))
-            self.config_list.addItem(item)
+        threading.Thread(target=scan, daemon=True).start()
+    
+    @pyqtSlot(int, list)
+    def _populate_config_list(self, scan_id: int, configs: list) -> None:
+        """Fill the config file list with the results of a scan."""
+        if scan_id != self._config_scan_id:
+            return  # A newer scan is still running
+        if configs == self._listed_configs:
+            return  # Most refreshes find the same files; keep the items
+        
+        # Apply only the difference, without repainting per item
+        self.config_list.setUpdatesEnabled(False)
+        
+        # Drop items whose file is gone; the rest keep their relative order
+        new_paths = set(configs)
+        for row in range(self.config_list.count() - 1, -1, -1):
+            if self.config_list.item(row).data(Qt.ItemDataRole.UserRole) not in new_paths:
+                self.config_list.takeItem(row)
+        
+        # Insert new files at their rows, front to back, so the rows
+        # before each insert already hold the right items
+        old_paths = set(self._listed_configs)
+        icon = None
+        for row, config_path in enumerate(configs):
+            if config_path in old_paths:
+                continue
+            if icon is None:
+                icon = get_icon("mdi.file-document", self.style_manager.get_icon_color())
+            item = QListWidgetItem(os.path.splitext(os.path.basename(config_path))[0])
+            item.setData(Qt.ItemDataRole.UserRole, config_path)
+            item.setIcon(icon)
+            self.config_list.insertItem(row, item)
+        
+        self._listed_configs = configs
+        self.config_list.setUpdatesEnabled(True)
     
     def _load_config(self, path: Path) -> bool:
         """Load a configuration file."""
+        self._flush_editor_changes()
         if self.config_manager.is_modified:
             reply = QMessageBox.question(
                 self,
                 "Unsaved Changes",
                 "You have unsaved changes. Do you want to save them?",
-                QMessageBox.StandardButton.Save |
-                QMessageBox.StandardButton.Discard |
-                QMessageBox.StandardButton.Cancel
+                self._SAVE_DISCARD_CANCEL
             )
             
             if reply == QMessageBox.StandardButton.Save:
@@ -638,14 +752,13 @@ class MainWindow(QMainWindow):
     # Action handlers
     def _on_new_config(self) -> None:
         """Create a new configuration."""
+        self._flush_editor_changes()
         if self.config_manager.is_modified:
             reply = QMessageBox.question(
                 self,
                 "Unsaved Changes",
                 "You have unsaved changes. Do you want to save them?",
-                QMessageBox.StandardButton.Save |
-                QMessageBox.StandardButton.Discard |
-                QMessageBox.StandardButton.Cancel
+                self._SAVE_DISCARD_CANCEL
             )
             
             if reply == QMessageBox.StandardButton.Save:
@@ -793,7 +906,7 @@ class MainWindow(QMainWindow):
                 self,
                 "Confirm Run",
                 "This will actually modify your files. Are you sure?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                self._YES_NO
             )
             if reply != QMessageBox.StandardButton.Yes:
                 return
@@ -802,16 +915,30 @@ class MainWindow(QMainWindow):
     
     def _execute(self, simulate: bool) -> None:
         """Execute the rules."""
-        # Sync content from active editor
+        # Sync content from active editor and validate it; visual-editor
+        # rules are validated as data. An empty config is turned away before
+        # any validation.
+        rules = None
         if self.editor_stack.currentIndex() == 1:
             content = self.config_editor.get_content()
+            is_empty = not content.strip()
         else:
             rules = self.rule_editor.get_rules()
-            import yaml
-            content = yaml.dump({"rules": rules}, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            is_empty = not rules
+        
+        if is_empty:
+            QMessageBox.warning(
+                self,
+                "Nothing to Run",
+                "The config has no rules to execute."
+            )
+            return
+        
+        if rules is None:
+            is_valid, error = self.config_manager.validate(content)
+        else:
+            is_valid, error = self.config_manager.validate_obj({"rules": rules})
         
-        # Validate config
-        is_valid, error = self.config_manager.validate(content)
         if not is_valid:
             QMessageBox.warning(
                 self,
@@ -824,26 +951,44 @@ class MainWindow(QMainWindow):
         if self.settings.run.clear_log_on_run:
             self.log_viewer.clear()
         
-        # Run the engine
-        self.rule_engine.run_from_string(
-            config_string=content,
-            config_path=self.config_manager.config_path,
-            simulate=simulate,
+        # Don't build debug entries the log viewer would filter out anyway
+        self.rule_engine.set_min_log_level(
+            "debug" if self.log_viewer.shows_level("debug") else "info"
         )
+        
+        # Run the engine
+        self._log_drain_timer.start()
+        if rules is not None:
+            # Visual-editor rules are already data; skip the YAML round trip
+            self.rule_engine.run_from_obj(
+                {"rules": rules},
+                config_path=self.config_manager.config_path,
+                simulate=simulate,
+            )
+        else:
+            self.rule_engine.run_from_string(
+                config_string=content,
+                config_path=self.config_manager.config_path,
+                simulate=simulate,
+            )
     
+    @pyqtSlot()
     def _on_stop(self) -> None:
         """Stop execution."""
         self.rule_engine.cancel()
     
+    @pyqtSlot()
     def _on_clear_log(self) -> None:
         """Clear the log viewer."""
         self.log_viewer.clear()
         self.rule_engine.clear_logs()
     
+    @pyqtSlot(bool)
     def _on_toggle_log(self, checked: bool) -> None:
         """Toggle log panel visibility."""
         self.log_viewer.setVisible(checked)
     
+    @pyqtSlot(object)
     def _on_execution_status_change(self, status: ExecutionStatus) -> None:
         """Handle execution status change."""
         self.exec_status.setText(status.name.title())
@@ -862,72 +1007,118 @@ class MainWindow(QMainWindow):
         elif status == ExecutionStatus.CANCELLED:
             self.status_label.setText("Cancelled")
     
-    def _on_log_entry(self, entry: LogEntry) -> None:
-        """Handle log entry from rule engine."""
-        self.log_viewer.add_entry(entry)
+    @pyqtSlot()
+    def _drain_log_queue(self) -> None:
+        """Move queued log entries from the rule engine into the log viewer."""
+        entries = self.rule_engine.drain_logs()
+        if entries:
+            self.log_viewer.add_entries(entries)
+        elif not self.rule_engine.is_running:
+            self._log_drain_timer.stop()
     
+    @pyqtSlot(object)
     def _on_execution_complete(self, result) -> None:
         """Handle execution completion."""
         self.status_label.setText(
             f"Done: {result.success_count} success, {result.error_count} errors"
         )
     
+    @pyqtSlot(object)
     def _on_config_file_changed(self, path: Path) -> None:
         """Handle external config file change."""
-        reply = QMessageBox.question(
-            self,
-            "File Changed",
-            f"The config file has been modified externally.\n\n"
-            f"Do you want to reload it?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
+        # Bursts of events are already debounced by ConfigFileWatcher;
+        # changes while the prompt is open are covered by the reload it offers
+        if self._reload_prompt_open:
+            return
+        
+        self._flush_editor_changes()
+        self._reload_prompt_open = True
+        try:
+            reply = QMessageBox.question(
+                self,
+                "File Changed",
+                f"The config file has been modified externally.\n\n"
+                f"Do you want to reload it?",
+                self._YES_NO
+            )
+        finally:
+            self._reload_prompt_open = False
         
         if reply == QMessageBox.StandardButton.Yes:
             self._load_config(path)
     
-    def _on_theme_change(self, theme: str) -> None:
-        """Handle theme change."""
-        self.settings.ui.theme = theme
-        self.settings.save()
+    @pyqtSlot(str)
+    def _on_theme_change(self, theme: str, *, persist: bool = True) -> None:
+        """
+        Handle theme change.
+        
+        Args:
+            theme: Theme name ("dark" or "light")
+            persist: Whether to save the choice to settings; callers that
+                already saved them pass False
+        """
+        # Update theme menu checkmarks (clicking the checked one unchecks it)
+        for name, action in self._theme_actions.items():
+            action.setChecked(name == theme)
+        
+        new_theme = Theme.DARK if theme == "dark" else Theme.LIGHT
+        if new_theme == self.style_manager.theme:
+            return  # Re-applying the same stylesheet would repolish every widget
+        
+        if persist:
+            self.settings.ui.theme = theme
+            self.settings.save()
         
-        self.style_manager.set_theme(Theme.DARK if theme == "dark" else Theme.LIGHT)
+        # Restyle the whole tree before repainting it once
+        self.setUpdatesEnabled(False)
+        self.style_manager.set_theme(new_theme)
         self.setStyleSheet(self.style_manager.get_stylesheet())
         
         # Refresh styles on child widgets
         self._refresh_child_styles()
-        
-        # Update theme menu checkmarks
-        for action in self._theme_actions:
-            action.setChecked(action.text().lower().replace("&", "") == theme)
+        self.setUpdatesEnabled(True)
     
-    def _refresh_child_styles(self) -> None:
-        """Refresh styles on all child widgets after theme change."""
-        colors = self.style_manager.colors
+    def _child_stylesheets(self) -> Dict[str, str]:
+        """
+        Get the per-widget stylesheets for the current theme.
         
-        # Refresh rule editor
-        if hasattr(self, 'rule_editor'):
-            self.rule_editor.refresh_style(self.style_manager)
+        They are formatted once per theme, so switching back and forth only
+        re-applies them.
         
-        # Refresh config editor
-        if hasattr(self, 'config_editor'):
-            self.config_editor.refresh_style(self.style_manager)
-        
-        # Refresh log viewer
-        if hasattr(self, 'log_viewer'):
-            self.log_viewer.refresh_style(self.style_manager)
+        Returns:
+            Dictionary mapping widget attribute names to stylesheets
+        """
+        theme = self.style_manager.theme
+        sheets = self._child_qss_cache.get(theme)
+        if sheets is not None:
+            return sheets
         
-        # Refresh sidebar
-        if hasattr(self, 'sidebar'):
-            self.sidebar.setStyleSheet(f"""
+        colors = self.style_manager.colors
+        tab_button = f"""
+            QPushButton {{
+                background-color: {colors["surface_variant"]};
+                color: {colors["text"]};
+                border: 1px solid {colors["border"]};
+                border-radius: 6px;
+                padding: 8px 16px;
+            }}
+            QPushButton:checked {{
+                background-color: {colors["primary"]};
+                color: {colors["background"]};
+                border: none;
+            }}
+            QPushButton:hover:!checked {{
+                background-color: {colors["hover"]};
+            }}
+        """
+        sheets = {
+            "sidebar": f"""
                 QFrame {{
                     background-color: {colors["surface"]};
                     border-right: 1px solid {colors["border"]};
                 }}
-            """)
-        
-        # Refresh config list
-        if hasattr(self, 'config_list'):
-            self.config_list.setStyleSheet(f"""
+            """,
+            "config_list": f"""
                 QListWidget {{
                     background-color: {colors["surface"]};
                     border: none;
@@ -941,64 +1132,30 @@ class MainWindow(QMainWindow):
                 QListWidget::item:hover:!selected {{
                     background-color: {colors["hover"]};
                 }}
-            """)
-        
-        # Refresh tab bar
-        if hasattr(self, 'tab_bar'):
-            self.tab_bar.setStyleSheet(f"""
+            """,
+            "tab_bar": f"""
                 QFrame {{
                     background-color: {colors["surface"]};
                     border-bottom: 1px solid {colors["border"]};
                 }}
-            """)
-        
-        # Refresh tab buttons
-        if hasattr(self, 'visual_tab'):
-            btn_style = f"""
-                QPushButton {{
-                    background-color: {colors["surface_variant"]};
-                    color: {colors["text"]};
-                    border: 1px solid {colors["border"]};
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                }}
-                QPushButton:checked {{
-                    background-color: {colors["primary"]};
-                    color: {colors["background"]};
-                    border: none;
-                }}
-                QPushButton:hover:!checked {{
-                    background-color: {colors["hover"]};
-                }}
-            """
-            self.visual_tab.setStyleSheet(btn_style)
-            self.yaml_tab.setStyleSheet(btn_style)
-        
-        # Refresh config label
-        if hasattr(self, 'config_label'):
-            self.config_label.setStyleSheet(f"color: {colors['text_secondary']};")
-        
-        # Refresh central widget and editor stack
-        if hasattr(self, 'central_widget'):
-            self.central_widget.setStyleSheet(f"background-color: {colors['background']};")
-        if hasattr(self, 'editor_stack'):
-            self.editor_stack.setStyleSheet(f"background-color: {colors['background']};")
-        if hasattr(self, 'editor_container'):
-            self.editor_container.setStyleSheet(f"background-color: {colors['background']};")
-        
-        # Refresh splitters
-        if hasattr(self, 'main_splitter'):
-            self.main_splitter.setStyleSheet(f"""
-                QSplitter::handle {{
-                    background-color: {colors["border"]};
-                }}
-            """)
-        if hasattr(self, 'right_splitter'):
-            self.right_splitter.setStyleSheet(f"""
-                QSplitter::handle {{
-                    background-color: {colors["border"]};
-                }}
-            """)
+            """,
+            "visual_tab": tab_button,
+            "yaml_tab": tab_button,
+            "config_label": f"color: {colors['text_secondary']};",
+        }
+        self._child_qss_cache[theme] = sheets
+        return sheets
+    
+    def _refresh_child_styles(self) -> None:
+        """Refresh styles on all child widgets after theme change."""
+        for refresh in self._style_refreshers:
+            refresh(self.style_manager)
+        
+        # Refresh sidebar, config list and tab bar. Backgrounds and splitter
+        # handles come from the window stylesheet; a sheet on the central
+        # widget would repolish everything below it a second time.
+        for name, qss in self._child_stylesheets().items():
+            getattr(self, name).setStyleSheet(qss)
     
     def _on_settings(self) -> None:
         """Open settings dialog."""
@@ -1006,8 +1163,10 @@ class MainWindow(QMainWindow):
         if dialog.exec():
             self.settings.save()
             # Apply settings
+            self.rule_engine.set_max_log_entries(self.settings.ui.log_max_lines)
+            self.log_viewer.set_max_entries(self.settings.ui.log_max_lines)
             if self.settings.ui.theme != ("dark" if self.style_manager.theme == Theme.DARK else "light"):
-                self._on_theme_change(self.settings.ui.theme)
+                self._on_theme_change(self.settings.ui.theme, persist=False)
     
     def _on_documentation(self) -> None:
         """Open documentation."""
@@ -1029,14 +1188,13 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event: QCloseEvent) -> None:
         """Handle window close event."""
+        self._flush_editor_changes()
         if self.config_manager.is_modified:
             reply = QMessageBox.question(
                 self,
                 "Unsaved Changes",
                 "You have unsaved changes. Do you want to save them?",
-                QMessageBox.StandardButton.Save |
-                QMessageBox.StandardButton.Discard |
-                QMessageBox.StandardButton.Cancel
+                self._SAVE_DISCARD_CANCEL
             )
             
             if reply == QMessageBox.StandardButton.Save:
@@ -5,6 +5,7 @@ Provides a graphical interface for creating and editing organize rules.
 
 from typing import List, Dict, Any, Optional
 from pathlib import Path
+from functools import lru_cache
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QFrame,
@@ -27,8 +28,9 @@ from .styles import StyleManager
 from ..utils.constants import FILTERS, ACTIONS, FILTER_MODES, FILE_CATEGORIES
 
 
+@lru_cache(maxsize=256)
 def get_icon(name: str, color: str = "#cdd6f4") -> QIcon:
-    """Get an icon, with fallback for missing qtawesome."""
+    """Get an icon (cached per name and color), with fallback for missing qtawesome."""
     if HAS_QTAWESOME:
         try:
             return qta.icon(name, color=color)
@@ -80,6 +82,7 @@ class RuleCard(QFrame):
     
     def _setup_ui(self) -> None:
         """Set up the UI components."""
+        icon_color = self.style_manager.get_icon_color()
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -147,24 +150,24 @@ class RuleCard(QFrame):
         btn_layout.setSpacing(4)
         
         edit_btn = QPushButton("Edit")
-        edit_btn.setIcon(get_icon("mdi.pencil", self.style_manager.get_icon_color()))
+        edit_btn.setIcon(get_icon("mdi.pencil", icon_color))
         edit_btn.clicked.connect(lambda: self.edit_requested.emit(self.index))
         btn_layout.addWidget(edit_btn)
         
         duplicate_btn = QToolButton()
-        duplicate_btn.setIcon(get_icon("mdi.content-copy", self.style_manager.get_icon_color()))
+        duplicate_btn.setIcon(get_icon("mdi.content-copy", icon_color))
         duplicate_btn.setToolTip("Duplicate")
         duplicate_btn.clicked.connect(lambda: self.duplicate_requested.emit(self.index))
         btn_layout.addWidget(duplicate_btn)
         
         up_btn = QToolButton()
-        up_btn.setIcon(get_icon("mdi.arrow-up", self.style_manager.get_icon_color()))
+        up_btn.setIcon(get_icon("mdi.arrow-up", icon_color))
         up_btn.setToolTip("Move up")
         up_btn.clicked.connect(lambda: self.move_up_requested.emit(self.index))
         btn_layout.addWidget(up_btn)
         
         down_btn = QToolButton()
-        down_btn.setIcon(get_icon("mdi.arrow-down", self.style_manager.get_icon_color()))
+        down_btn.setIcon(get_icon("mdi.arrow-down", icon_color))
         down_btn.setToolTip("Move down")
         down_btn.clicked.connect(lambda: self.move_down_requested.emit(self.index))
         btn_layout.addWidget(down_btn)
@@ -199,13 +202,17 @@ class RuleEditDialog(QDialog):
         
         self.setWindowTitle("Edit Rule")
         self.setMinimumSize(700, 600)
-        self.setStyleSheet(style_manager.get_stylesheet())
+        # A parented dialog inherits the main window's stylesheet; setting
+        # it again would re-parse and re-resolve it for every child widget
+        if parent is None:
+            self.setStyleSheet(style_manager.get_stylesheet())
         
         self._setup_ui()
         self._load_rule()
     
     def _setup_ui(self) -> None:
         """Set up the dialog UI."""
+        icon_color = self.style_manager.get_icon_color()
         layout = QVBoxLayout(self)
         layout.setSpacing(16)
         
@@ -255,7 +262,7 @@ class RuleEditDialog(QDialog):
         loc_btn_layout = QHBoxLayout()
         
         add_loc_btn = QPushButton("Add Location")
-        add_loc_btn.setIcon(get_icon("mdi.folder-plus", self.style_manager.get_icon_color()))
+        add_loc_btn.setIcon(get_icon("mdi.folder-plus", icon_color))
         add_loc_btn.clicked.connect(self._add_location)
         loc_btn_layout.addWidget(add_loc_btn)
         
@@ -281,11 +288,11 @@ class RuleEditDialog(QDialog):
         filter_btn_layout = QHBoxLayout()
         
         add_filter_btn = QPushButton("Add Filter")
-        add_filter_btn.setIcon(get_icon("mdi.filter-plus", self.style_manager.get_icon_color()))
+        add_filter_btn.setIcon(get_icon("mdi.filter-plus", icon_color))
         add_filter_menu = QMenu()
         for filter_name, filter_info in FILTERS.items():
             action = add_filter_menu.addAction(
-                get_icon(filter_info.get("icon", "mdi.filter"), self.style_manager.get_icon_color()),
+                get_icon(filter_info.get("icon", "mdi.filter"), icon_color),
                 filter_info["name"]
             )
             action.setData(filter_name)
@@ -315,11 +322,11 @@ class RuleEditDialog(QDialog):
         action_btn_layout = QHBoxLayout()
         
         add_action_btn = QPushButton("Add Action")
-        add_action_btn.setIcon(get_icon("mdi.plus-box", self.style_manager.get_icon_color()))
+        add_action_btn.setIcon(get_icon("mdi.plus-box", icon_color))
         add_action_menu = QMenu()
         for action_name, action_info in ACTIONS.items():
             action = add_action_menu.addAction(
-                get_icon(action_info.get("icon", "mdi.flash"), self.style_manager.get_icon_color()),
+                get_icon(action_info.get("icon", "mdi.flash"), icon_color),
                 action_info["name"]
             )
             action.setData(action_name)
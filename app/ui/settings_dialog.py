@@ -2,6 +2,7 @@
 Settings dialog for configuring application preferences.
 """
 
+from functools import lru_cache
 from typing import Optional
 
 from PyQt6.QtWidgets import (
@@ -22,8 +23,9 @@ from .styles import StyleManager
 from ..core.settings import Settings
 
 
+@lru_cache(maxsize=256)
 def get_icon(name: str, color: str = "#cdd6f4"):
-    """Get an icon, with fallback for missing qtawesome."""
+    """Get an icon (cached per name and color), with fallback for missing qtawesome."""
     if HAS_QTAWESOME:
         try:
             return qta.icon(name, color=color)
@@ -58,7 +60,10 @@ class SettingsDialog(QDialog):
         
         self.setWindowTitle("Settings")
         self.setMinimumSize(600, 500)
-        self.setStyleSheet(style_manager.get_stylesheet())
+        # A parented dialog inherits the main window's stylesheet; setting
+        # it again would re-parse and re-resolve it for every child widget
+        if parent is None:
+            self.setStyleSheet(style_manager.get_stylesheet())
         
         self._setup_ui()
         self._load_settings()
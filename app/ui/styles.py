@@ -77,8 +77,9 @@ class StyleManager:
         Args:
             theme: Initial theme
         """
-        self._theme = theme
-        self._colors = COLORS["dark"]
+        # Generated stylesheets by palette name
+        self._stylesheets: Dict[str, str] = {}
+        self.set_theme(theme)
     
     @property
     def theme(self) -> Theme:
@@ -104,11 +105,12 @@ class StyleManager:
             try:
                 import darkdetect
                 is_dark = darkdetect.isDark()
-                self._colors = COLORS["dark" if is_dark else "light"]
+                self._palette = "dark" if is_dark else "light"
             except ImportError:
-                self._colors = COLORS["dark"]
+                self._palette = "dark"
         else:
-            self._colors = COLORS["dark" if theme == Theme.DARK else "light"]
+            self._palette = "dark" if theme == Theme.DARK else "light"
+        self._colors = COLORS[self._palette]
     
     def get_color(self, name: str) -> str:
         """
@@ -126,9 +128,18 @@ class StyleManager:
         """
         Get the complete QSS stylesheet.
         
+        The stylesheet is generated once per palette.
+        
         Returns:
             QSS stylesheet string
         """
+        stylesheet = self._stylesheets.get(self._palette)
+        if stylesheet is None:
+            stylesheet = self._stylesheets[self._palette] = self._build_stylesheet()
+        return stylesheet
+    
+    def _build_stylesheet(self) -> str:
+        """Generate the QSS stylesheet for the current colors."""
         c = self._colors
         
         return f"""
@@ -4,6 +4,7 @@ Helper functions and utilities for the desktop application.
 
 import os
 import sys
+import tempfile
 import subprocess
 import webbrowser
 from pathlib import Path
@@ -306,3 +307,63 @@ def create_backup_path(path: Union[str, Path]) -> Path:
     path = Path(path)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return path.with_name(f"{path.stem}_backup_{timestamp}{path.suffix}")
+
+
+def write_file_atomic(
+    path: Union[str, Path],
+    data: bytes,
+    sync: bool = True,
+    mode: Optional[int] = None,
+) -> None:
+    """
+    Write a file atomically.
+    
+    The data goes to a uniquely named temporary file in the same directory,
+    which then replaces the target, so a crash never leaves a truncated
+    file and concurrent writers never share a temporary file.
+    
+    Args:
+        path: File to write
+        data: File contents
+        sync: fsync the file and its directory, which costs a few ms
+        mode: Permissions for a new file; an existing file keeps its own.
+            None leaves a new file readable by its owner only
+    
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        pass
+    
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    view = memoryview(data)
+    try:
+        try:
+            while view:
+                view = view[os.write(fd, view):]
+            if sync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        if mode is not None:
+            os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    
+    if sync and hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself (POSIX only)
+        try:
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
@@ -6,10 +6,20 @@ import pytest
 from pathlib import Path
 import tempfile
 import json
+import threading
+
+import yaml
 
 from app.core.settings import Settings, UISettings, RunSettings, EditorSettings
 from app.core.config_manager import ConfigManager
 from app.core.rule_engine import RuleEngine, LogEntry, ExecutionStatus
+from app.core.file_watcher import (
+    ConfigFileWatcher,
+    FileEvent,
+    FileEventHandler,
+    FileEventType,
+    FileWatcher,
+)
 from app.utils.helpers import format_size, format_datetime, validate_yaml
 
 
@@ -70,6 +80,66 @@ class TestSettings:
             settings.add_recent_file(f"/path/to/file{i}.yaml", f"file{i}.yaml")
         
         assert len(settings.recent_files) == 10
+    
+    def test_reopened_recent_file_moves_to_front(self):
+        """Test that re-adding a recent file replaces its old entry."""
+        settings = Settings(_app_name="test-app")
+        settings._settings_path = Path(tempfile.gettempdir()) / "test_settings.json"
+        
+        settings.add_recent_file("/path/to/a.yaml")
+        settings.add_recent_file("/path/to/b.yaml")
+        settings.add_recent_file("/path/to/a.yaml")
+        
+        assert [f["path"] for f in settings.recent_files] == ["/path/to/a.yaml", "/path/to/b.yaml"]
+        settings.clear_recent_files()
+        assert settings.recent_files == []
+    
+    def test_changes_are_saved_once_after_delay(self, tmp_path, monkeypatch):
+        """Test that mutators coalesce into a single deferred save."""
+        import time
+        
+        settings = Settings(_app_name="test-app")
+        settings._settings_path = tmp_path / "settings.json"
+        monkeypatch.setattr(Settings, "SAVE_DELAY", 0.05)
+        
+        saves = []
+        original_save = Settings.save
+        monkeypatch.setattr(
+            Settings, "save", lambda self, sync=True: saves.append(sync) or original_save(self, sync)
+        )
+        
+        settings.add_pinned_location("/a")
+        settings.add_pinned_location("/b")
+        settings.add_recent_file("/path/to/file.yaml")
+        assert not settings._settings_path.exists()
+        
+        time.sleep(0.3)
+        assert saves == [False]
+        data = json.loads(settings._settings_path.read_text(encoding="utf-8"))
+        assert data["pinned_locations"] == ["/a", "/b"]
+        assert settings.flush() is True
+        assert saves == [False]
+    
+    def test_concurrent_saves_do_not_clash(self, tmp_path):
+        """Test that saves from two threads each write a complete file."""
+        settings = Settings(_app_name="test-app")
+        settings._settings_path = tmp_path / "settings.json"
+        
+        def save_repeatedly():
+            for _ in range(50):
+                settings.save(sync=False)
+        
+        worker = threading.Thread(target=save_repeatedly)
+        worker.start()
+        for i in range(50):
+            settings.add_recent_file(f"/path/to/file{i}.yaml")
+            assert settings.save(sync=False) is True
+        worker.join()
+        settings.flush()
+        
+        data = json.loads(settings._settings_path.read_text(encoding="utf-8"))
+        assert data["recent_files"][0]["path"] == "/path/to/file49.yaml"
+        assert list(tmp_path.glob("*.tmp")) == []
 
 
 class TestConfigManager:
@@ -122,6 +192,22 @@ rules:
         assert result is False
         assert manager.last_error is not None
     
+    def test_tagged_values_load_like_organize(self):
+        """Test that !tagged values load as organize loads them."""
+        manager = ConfigManager()
+        
+        config = """
+rules:
+  - locations: ~/Downloads
+    actions:
+      - echo: !hello world
+"""
+        
+        assert manager.set_content(config) is True
+        expected = yaml.load(config, Loader=yaml.SafeLoader)["rules"]
+        assert manager.get_rules() == expected
+        assert manager.validate(config) == (True, None)
+    
     def test_get_rules(self):
         """Test getting rules from config."""
         manager = ConfigManager()
@@ -164,6 +250,113 @@ rules:
         assert result is True
         assert "New Rule" in manager.raw_content
     
+    def test_save_leaves_unrelated_tmp_file_alone(self, tmp_path):
+        """Test that saving does not write through a fixed temp file name."""
+        config_path = tmp_path / "config.yaml"
+        stray = tmp_path / "config.yaml.tmp"
+        stray.write_text("mine", encoding="utf-8")
+        
+        manager = ConfigManager()
+        manager.set_rules([{"name": "Rule", "locations": "~", "actions": ["echo"]}])
+        assert manager.save(config_path) is True
+        
+        assert stray.read_text(encoding="utf-8") == "mine"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["config.yaml", "config.yaml.tmp"]
+    
+    def test_unserializable_rules_are_kept_pending(self, tmp_path):
+        """Test that rule edits that cannot be dumped are not saved over."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("rules: []\n", encoding="utf-8")
+        manager = ConfigManager()
+        assert manager.load(config_path)
+        
+        manager.set_rules([{"name": object()}])
+        assert manager.save() is False
+        assert manager.last_error.startswith("Error serializing rules")
+        assert config_path.read_text(encoding="utf-8") == "rules: []\n"
+        
+        manager.set_rules([{"name": "Fixed"}])
+        assert manager.save() is True
+        assert "Fixed" in config_path.read_text(encoding="utf-8")
+    
+    def test_unchanged_content_is_not_reparsed(self, monkeypatch):
+        """Test that reloading identical content reuses the cached parse."""
+        import yaml
+        
+        manager = ConfigManager()
+        config = """
+rules:
+  - name: Rule 1
+    locations: ~/Downloads
+    actions:
+      - echo: "1"
+"""
+        
+        manager.load_from_string(config)
+        assert len(manager.get_rules()) == 1
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("content was parsed again")
+        
+        monkeypatch.setattr(yaml, "load", fail)
+        manager.load_from_string(config)
+        assert manager.set_content(config) is True
+        assert manager.get_rules()[0]["name"] == "Rule 1"
+    
+    def test_set_content_defers_schema_validation(self):
+        """Test that set_content only checks YAML syntax unless asked."""
+        manager = ConfigManager()
+        
+        config = """
+rules:
+  - name: Bad Rule
+    locations: ~/Downloads
+    actions:
+      - no_such_action: 1
+"""
+        
+        assert manager.set_content(config) is True
+        assert manager.is_valid is False
+        assert manager.last_error is not None
+        
+        assert manager.set_content(config, validate_schema=True) is False
+        assert manager.set_content("rules: [") is False
+    
+    def test_validate_reuses_result_for_same_content(self, monkeypatch):
+        """Test that validating unchanged content does not rebuild the Config."""
+        from organize import Config
+        
+        manager = ConfigManager()
+        content = "rules:\n  - locations: ~/Downloads\n    actions:\n      - echo: hi\n"
+        
+        calls = []
+        original = Config.from_string
+        
+        def counting_from_string(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+        
+        monkeypatch.setattr(Config, "from_string", counting_from_string)
+        
+        assert manager.validate(content) == (True, None)
+        assert manager.validate(content) == (True, None)
+        assert len(calls) == 1
+        
+        assert manager.validate("rules: [")[0] is False
+        assert len(calls) == 2
+    
+    def test_validate_obj_matches_validate(self):
+        """Test that validating parsed data agrees with validating the YAML."""
+        manager = ConfigManager()
+        good = {"rules": [{"locations": "~/Downloads", "actions": [{"echo": "hi"}]}]}
+        bad = {"rules": [{"locations": "~/Downloads", "actions": [{"no_such_action": 1}]}]}
+        
+        assert manager.validate_obj(good) == (True, None)
+        assert manager.validate(yaml.safe_dump(good)) == (True, None)
+        assert manager.validate_obj(bad)[0] is False
+        assert manager.validate(yaml.safe_dump(bad))[0] is False
+        assert manager.validate_obj({})[0] is False
+    
     def test_add_rule(self):
         """Test adding a rule."""
         manager = ConfigManager()
@@ -201,6 +394,33 @@ rules:
         assert len(rules) == 1
         assert rules[0]["name"] == "Rule 2"
     
+    def test_rule_mutators_keep_content_in_sync(self):
+        """Test that successive rule edits are reflected in the raw YAML."""
+        manager = ConfigManager()
+        
+        config = """
+rules:
+  - name: Rule 1
+    actions:
+      - echo: "1"
+  - name: Rule 2
+    actions:
+      - echo: "2"
+"""
+        
+        manager.load_from_string(config)
+        manager.move_rule(0, 1)
+        manager.duplicate_rule(0)
+        
+        rules = manager.get_rules()
+        rules.clear()
+        
+        reloaded = ConfigManager()
+        reloaded.load_from_string(manager.raw_content)
+        names = [rule["name"] for rule in reloaded.get_rules()]
+        assert names == ["Rule 2", "Rule 2 (copy)", "Rule 1"]
+        assert [rule["name"] for rule in manager.get_rules()] == names
+    
     def test_save_and_load_file(self):
         """Test saving and loading a config file."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -219,6 +439,26 @@ rules:
             
             assert result is True
             assert manager2.is_valid
+    
+    def test_load_large_file(self):
+        """Test loading a config file large enough to be memory-mapped."""
+        from app.core.config_manager import MMAP_THRESHOLD
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rule = '  - name: "Rule {}"\r\n    locations: ~/Downloads\r\n    actions:\r\n      - echo: "x"\r\n'
+            content = "rules:\r\n"
+            i = 0
+            while len(content) <= MMAP_THRESHOLD:
+                content += rule.format(i)
+                i += 1
+            
+            config_path = Path(tmpdir) / "large.yaml"
+            config_path.write_bytes(content.encode("utf-8"))
+            
+            manager = ConfigManager()
+            assert manager.load(config_path) is True
+            assert "\r" not in manager.raw_content
+            assert len(manager.get_rules()) == i
 
 
 class TestRuleEngine:
@@ -247,6 +487,17 @@ class TestRuleEngine:
         assert entry.message == "Test message"
         assert entry.rule_name == "Test Rule"
     
+    def test_log_entry_timestamp_ns(self):
+        """Test that LogEntry stores nanoseconds and formats them lazily."""
+        from datetime import datetime
+        
+        now = datetime(2024, 5, 6, 7, 8, 9, 123456)
+        entry = LogEntry(timestamp=now, level="info", message="Test message")
+        
+        assert entry.timestamp == now
+        assert entry.format_time("%Y-%m-%d %H:%M:%S") == "2024-05-06 07:08:09"
+        assert LogEntry(entry.timestamp_ns, "info", "copy").timestamp == now
+    
     def test_log_entry_to_dict(self):
         """Test LogEntry serialization."""
         from datetime import datetime
@@ -265,6 +516,239 @@ class TestRuleEngine:
         assert data["level"] == "success"
         assert data["message"] == "File moved"
         assert data["file_path"] == "/path/to/file.txt"
+    
+    def test_logs_are_bounded(self):
+        """Test that only the most recent log entries are retained."""
+        from app.core.rule_engine import GuiOutput
+        
+        engine = RuleEngine(max_log_entries=3)
+        output = GuiOutput(on_msg=engine._log_entry)
+        
+        for i in range(5):
+            output._log("error", f"message {i}")
+        
+        assert [entry.message for entry in engine.logs] == [
+            "message 2", "message 3", "message 4"
+        ]
+        assert engine.result.error_count == 5
+        
+        engine.set_max_log_entries(2)
+        assert [entry.message for entry in engine.logs] == ["message 3", "message 4"]
+    
+    def test_cleared_log_entries_are_left_intact(self):
+        """Test that entries kept past clear_logs are not reused."""
+        from app.core.rule_engine import GuiOutput
+        
+        engine = RuleEngine()
+        output = GuiOutput(on_msg=engine._log_entry)
+        
+        output._log("info", "first", rule_name="Rule")
+        first = engine.logs[0]
+        engine.clear_logs()
+        assert len(engine.logs) == 0
+        
+        output._log("error", "second")
+        assert engine.logs[0] is not first
+        assert first.level == "info"
+        assert first.message == "first"
+        assert first.rule_name == "Rule"
+    
+    def test_queued_logs_are_drained_in_batches(self):
+        """Test that queue_logs hands entries to drain_logs instead of on_log."""
+        from app.core.rule_engine import GuiOutput
+        
+        calls = []
+        engine = RuleEngine(queue_logs=True)
+        engine.set_callbacks(on_log=calls.append)
+        output = GuiOutput(on_msg=engine._log_entry)
+        
+        for i in range(5):
+            output._log("info", f"message {i}")
+        
+        assert calls == []
+        first = engine.drain_logs(max_entries=3)
+        rest = engine.drain_logs()
+        assert [e.message for e in first] == ["message 0", "message 1", "message 2"]
+        assert [e.message for e in rest] == ["message 3", "message 4"]
+        assert engine.drain_logs() == []
+    
+    def test_min_log_level_skips_debug_entries(self):
+        """Test that debug messages are dropped below the minimum level."""
+        from datetime import datetime
+        
+        from app.core.rule_engine import GuiOutput
+        
+        engine = RuleEngine()
+        engine.set_min_log_level("info")
+        output = GuiOutput(on_msg=engine._log_entry, min_level="info")
+        
+        output.start(simulate=True, config_path=Path("config.yaml"), working_dir=Path("."))
+        output._log("debug", "hidden")
+        engine._log_entry(LogEntry(timestamp=datetime.now(), level="debug", message="direct"))
+        
+        assert [e.level for e in engine.logs] == ["info"]
+    
+    def test_export_logs_formats(self, tmp_path):
+        """Test that streamed exports match the formats built in memory."""
+        from app.core.rule_engine import GuiOutput
+        
+        engine = RuleEngine()
+        empty = tmp_path / "empty.json"
+        assert engine.export_logs(empty, "json")
+        assert json.loads(empty.read_text(encoding="utf-8")) == []
+        
+        output = GuiOutput(on_msg=engine._log_entry)
+        output._log("info", "first", rule_name="Rule")
+        output._log("error", "second\nline")
+        output._log("success", "café ✓", file_path="/tmp/naïve.txt")
+        
+        txt_path = tmp_path / "log.txt"
+        assert engine.export_logs(txt_path, "txt")
+        lines = txt_path.read_text(encoding="utf-8").split("\n")
+        assert len(lines) == 4
+        assert lines[0].endswith("[INFO] first")
+        assert lines[3].endswith("[SUCCESS] café ✓")
+        
+        json_path = tmp_path / "log.json"
+        assert engine.export_logs(json_path, "json")
+        expected = json.dumps(
+            [e.to_dict() for e in engine.logs], indent=2, ensure_ascii=False
+        )
+        assert json_path.read_text(encoding="utf-8") == expected
+    
+    def test_run_from_string_parses_on_worker_thread(self):
+        """Test that an invalid config string fails the run from the worker."""
+        engine = RuleEngine()
+        
+        engine.run_from_string("rules: [", simulate=True)
+        engine._thread.join(timeout=10)
+        
+        assert engine.status == ExecutionStatus.FAILED
+        assert engine.logs[-1].message.startswith("Failed to parse config")
+    
+    def test_run_from_obj_builds_config_on_worker_thread(self, tmp_path):
+        """Test that a config dictionary runs without a YAML round trip."""
+        engine = RuleEngine()
+        
+        engine.run_from_obj(
+            {"rules": [{"locations": [str(tmp_path)], "actions": [{"echo": "hi"}]}]},
+            simulate=True,
+        )
+        engine._thread.join(timeout=10)
+        assert engine.status == ExecutionStatus.COMPLETED
+        
+        engine.run_from_obj({"rules": [{"actions": "bogus"}]}, simulate=True)
+        engine._thread.join(timeout=10)
+        assert engine.status == ExecutionStatus.FAILED
+        assert engine.logs[-1].message.startswith("Failed to parse config")
+
+
+class TestFileEventHandler:
+    """Tests for the FileEventHandler class."""
+    
+    def test_pattern_filtering(self):
+        """Test include and ignore pattern matching."""
+        handler = FileEventHandler(
+            on_event=lambda event: None,
+            patterns={"*.yaml", "*.yml"},
+            ignore_patterns={"*_backup_*"},
+        )
+        
+        assert handler._should_process("/configs/config.yaml", False) is True
+        assert handler._should_process("/configs/config.yml", False) is True
+        assert handler._should_process("/configs/notes.txt", False) is False
+        assert handler._should_process("/configs/config_backup_1.yaml", False) is False
+    
+    def test_ignore_directories(self):
+        """Test that directory events can be ignored."""
+        handler = FileEventHandler(on_event=lambda event: None, ignore_directories=True)
+        
+        assert handler._should_process("/configs/sub", True) is False
+        assert handler._should_process("/configs/file.txt", False) is True
+    
+    def test_dispatch_watchdog_events(self):
+        """Test that watchdog events are converted to FileEvents."""
+        from watchdog.events import DirCreatedEvent, FileMovedEvent
+        
+        # Events are recycled after the callback, so record their fields
+        events = []
+        handler = FileEventHandler(
+            on_event=lambda e: events.append((e.event_type, e.is_directory, e.dest_path))
+        )
+        
+        handler.dispatch(DirCreatedEvent("/configs/sub"))
+        handler.dispatch(FileMovedEvent("/configs/a.yaml", "/configs/b.yaml"))
+        
+        assert events[0] == (FileEventType.CREATED, True, None)
+        assert events[1] == (FileEventType.MOVED, False, Path("/configs/b.yaml"))
+
+
+class TestFileWatcher:
+    """Tests for the FileWatcher class."""
+    
+    def test_add_and_remove_paths(self):
+        """Test registering and removing watched paths without starting."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = FileWatcher()
+            first = Path(tmpdir) / "first"
+            second = Path(tmpdir) / "second"
+            first.mkdir()
+            second.mkdir()
+            
+            assert watcher.add_path(first) is True
+            assert watcher.add_path(second) is True
+            assert watcher.add_path(Path(tmpdir) / "missing") is False
+            assert len(watcher.watched_paths) == 2
+            
+            assert watcher.remove_path(first) is True
+            assert watcher.remove_path(first) is False
+            
+            watcher.clear()
+            assert watcher.watched_paths == []
+    
+    def test_events_are_routed_to_owning_watch(self):
+        """Test that the shared handler applies each watch's own filters."""
+        from watchdog.events import FileCreatedEvent
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir).resolve()
+            configs = root / "configs"
+            configs.mkdir()
+            
+            seen = []
+            watcher = FileWatcher()
+            watcher.set_callbacks(on_event=lambda e: seen.append(e.path.name))
+            watcher.add_path(root, ignore_patterns={"*.tmp"})
+            watcher.add_path(configs, patterns={"*.yaml"})
+            
+            watcher._handler.dispatch(FileCreatedEvent(str(root / "a.txt")))
+            watcher._handler.dispatch(FileCreatedEvent(str(root / "a.tmp")))
+            watcher._handler.dispatch(FileCreatedEvent(str(configs / "b.yaml")))
+            watcher._handler.dispatch(FileCreatedEvent(str(configs / "b.txt")))
+            watcher._handler.dispatch(FileCreatedEvent("/elsewhere/c.txt"))
+            
+            assert seen == ["a.txt", "b.yaml"]
+    
+    def test_config_changes_are_debounced(self):
+        """Test that a burst of config modifications fires one callback."""
+        import time
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir).resolve() / "config.yaml"
+            config_path.write_text("rules: []\n")
+            
+            changes = []
+            watcher = ConfigFileWatcher()
+            watcher.set_config_callback(changes.append)
+            watcher.watch_config(config_path)
+            
+            for _ in range(5):
+                watcher._handle_event(
+                    FileEvent(FileEventType.MODIFIED, config_path, False)
+                )
+            
+            time.sleep(watcher.DEBOUNCE_INTERVAL * 6)
+            assert changes == [config_path]
 
 
 class TestHelpers: